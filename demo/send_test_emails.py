@@ -1,106 +1,175 @@
 #!/usr/bin/env python3
 """Send test emails to populate the demo mailbox."""
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-from email.utils import make_msgid
-from datetime import datetime, timedelta
+import asyncio
+import itertools
+import os
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from email.headerregistry import Address
+from email.message import EmailMessage
+from email.policy import SMTP
+from email.utils import format_datetime
+from datetime import UTC, datetime, timedelta
+
+import aiosmtplib
 
 SMTP_HOST = "localhost"
 SMTP_PORT = 3025
 
+# Persistent SMTP sessions; also caps how many sends are in flight at once.
+MAX_WORKERS = 5
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.1
+# Transient server replies worth a reconnect + retry.
+RETRYABLE_CODES = frozenset({421, 450, 451})
+
+# One interned Address per mailbox, shared by every message that uses it
+ALICE = Address(addr_spec=sys.intern("alice@example.com"))
+BOB = Address(addr_spec=sys.intern("bob@example.com"))
+CEO = Address(addr_spec=sys.intern("ceo@example.com"))
+CHARLIE = Address(addr_spec=sys.intern("charlie@example.com"))
+HR = Address(addr_spec=sys.intern("hr@example.com"))
+NEWSLETTER = Address(addr_spec=sys.intern("newsletter@example.com"))
+SUPPORT = Address(addr_spec=sys.intern("support@example.com"))
+DEMO = Address(addr_spec=sys.intern("demo@example.com"))
+
+# The demo's closed set of attachment types, pre-split into (maintype, subtype)
+_TYPE_MAP = {
+    "text/plain": ("text", "plain"),
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": (
+        "application",
+        "vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+}
+
+# Every Date header is offset from this one clock read
+_BASE = datetime.now(UTC)
+
+# Message-IDs are <n.seed@clerk.local>; the seed keeps separate runs distinct
+_MSGID_SEED = f"{os.getpid()}.{int(time.time())}"
+_MSGID_COUNTER = itertools.count()
+
 # Store message IDs for threading
 message_ids: dict[str, str] = {}
 
 
-def send_email(
-    from_addr: str,
-    to_addr: str,
-    subject: str,
-    body: str,
-    attachments: list | None = None,
-    in_reply_to: str | None = None,
-    references: list[str] | None = None,
-    message_id_key: str | None = None,
-    hours_ago: int = 0,
-):
-    """Send a test email with optional threading support."""
-    if attachments:
-        msg = MIMEMultipart()
-        msg.attach(MIMEText(body, "plain"))
-        for filename, content, content_type in attachments:
-            if content_type.startswith("text/"):
-                part = MIMEBase("text", content_type.split("/")[1])
-            else:
-                main_type, sub_type = content_type.split("/")
-                part = MIMEBase(main_type, sub_type)
-            part.set_payload(content.encode() if isinstance(content, str) else content)
-            encoders.encode_base64(part)
-            part.add_header("Content-Disposition", f"attachment; filename={filename}")
-            msg.attach(part)
-    else:
-        msg = MIMEText(body)
-
-    msg["Subject"] = subject
-    msg["From"] = from_addr
-    msg["To"] = to_addr
-
-    # Generate and store message ID
-    msg_id = make_msgid()
+@dataclass(slots=True, frozen=True)
+class EmailSpec:
+    """One demo message; threading fields name earlier specs by message_id_key."""
+
+    from_addr: Address
+    to_addr: Address
+    subject: str
+    body: str
+    # Payloads are bytes literals, so nothing is encoded per message
+    attachments: tuple[tuple[str, bytes, str], ...] = ()
+    in_reply_to: str | None = None
+    references: tuple[str, ...] = ()
+    message_id_key: str | None = None
+    hours_ago: int = 0
+
+
+def build_message(spec: EmailSpec) -> EmailMessage:
+    """Build a test email from its spec, resolving thread keys via message_ids."""
+    # Demo bodies are plain ASCII, so skip charset detection
+    msg = EmailMessage()
+    msg.set_content(spec.body, cte="7bit")
+    for filename, content, content_type in spec.attachments:
+        main_type, sub_type = _TYPE_MAP[content_type]
+        msg.add_attachment(content, maintype=main_type, subtype=sub_type, filename=filename)
+
+    msg["Subject"] = spec.subject
+    msg["From"] = spec.from_addr
+    msg["To"] = spec.to_addr
+
+    msg_id = f"<{next(_MSGID_COUNTER)}.{_MSGID_SEED}@clerk.local>"
     msg["Message-ID"] = msg_id
-    if message_id_key:
-        message_ids[message_id_key] = msg_id
+    if spec.message_id_key:
+        message_ids[spec.message_id_key] = msg_id
 
     # Set threading headers
-    if in_reply_to:
-        msg["In-Reply-To"] = in_reply_to
-    if references:
-        msg["References"] = " ".join(references)
+    if spec.in_reply_to:
+        msg["In-Reply-To"] = message_ids[spec.in_reply_to]
+    if spec.references:
+        msg["References"] = " ".join(message_ids[key] for key in spec.references)
 
     # Set date (offset for realistic ordering)
-    date = datetime.now() - timedelta(hours=hours_ago)
-    msg["Date"] = date.strftime("%a, %d %b %Y %H:%M:%S +0000")
-
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.send_message(msg)
-    print(f"  Sent: {subject[:50]}...")
-
-    return msg_id
-
-
-def main():
-    print("Sending test emails...")
-
-    # ========================================================================
-    # Basic Emails (1-3)
-    # ========================================================================
-
-    # Email 1: Simple message from Alice
-    send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="Welcome to the team!",
-        body="""Hi there,
+    msg["Date"] = format_datetime(_BASE - timedelta(hours=spec.hours_ago))
+
+    return msg
+
+
+async def _connect(client: aiosmtplib.SMTP) -> None:
+    """Open a session with Nagle disabled for the small command/reply traffic."""
+    await client.connect()
+    sock = client.transport.get_extra_info("socket")
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+async def send_message(pool: asyncio.Queue, msg: EmailMessage, log: list[str]) -> None:
+    """Send one message on an idle pooled session, reconnecting on transient errors."""
+    raw = msg.as_bytes(policy=SMTP)
+    client = await pool.get()
+    try:
+        attempt = 1
+        while True:
+            try:
+                await client.sendmail(str(msg["From"]), [str(msg["To"])], raw)
+                break
+            except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPResponseException) as e:
+                code = getattr(e, "code", None)
+                if attempt >= MAX_ATTEMPTS or (code is not None and code not in RETRYABLE_CODES):
+                    raise
+            client.close()
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            await _connect(client)
+            attempt += 1
+    finally:
+        pool.put_nowait(client)
+    log.append(f"  Sent: {msg['Subject'][:50]}...")
+
+
+async def send_all(messages: list[EmailMessage], log: list[str]) -> None:
+    """Send every message concurrently over a small pool of persistent SMTP sessions."""
+    # Resolved once per run (not at import) so every session and reconnect
+    # connects straight to an IP literal, no lookup
+    host, port = socket.getaddrinfo(SMTP_HOST, SMTP_PORT, socket.AF_INET, socket.SOCK_STREAM)[0][4]
+    clients = [
+        aiosmtplib.SMTP(hostname=host, port=port, start_tls=False)
+        for _ in range(MAX_WORKERS)
+    ]
+    pool: asyncio.Queue = asyncio.Queue()
+    try:
+        await asyncio.gather(*(_connect(client) for client in clients))
+        for client in clients:
+            pool.put_nowait(client)
+        await asyncio.gather(*(send_message(pool, msg, log) for msg in messages))
+    finally:
+        for client in clients:
+            if not client.is_connected:
+                continue
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+# Create a minimal mock XLSX file (just headers to simulate)
+XLSX_MOCK = b"PK\x03\x04MOCK_XLSX_CONTENT_FOR_DEMO"  # Not a real xlsx, but works for testing
+
+WELCOME_BODY = """Hi there,
 
 Welcome to the team! I wanted to reach out and say hello.
 
 Let me know if you need anything to get started.
 
 Best,
-Alice""",
-        message_id_key="welcome",
-        hours_ago=48,
-    )
+Alice"""
 
-    # Email 2: Project update from Bob (thread starter)
-    q1_id = send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Q1 Project Update",
-        body="""Hi,
+Q1_UPDATE_BODY = """Hi,
 
 Here's the Q1 project update:
 
@@ -111,58 +180,24 @@ Here's the Q1 project update:
 We're on track for the deadline. Let me know if you have questions.
 
 Thanks,
-Bob""",
-        message_id_key="q1_update",
-        hours_ago=36,
-    )
+Bob"""
 
-    # Email 3: Meeting request (thread starter)
-    meeting_id = send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="Meeting tomorrow?",
-        body="""Hey,
+MEETING_BODY = """Hey,
 
 Are you free tomorrow at 2pm for a quick sync? I wanted to discuss
 the roadmap for next quarter.
 
 Let me know!
-Alice""",
-        message_id_key="meeting",
-        hours_ago=30,
-    )
+Alice"""
 
-    # ========================================================================
-    # Emails with Attachments (4, 18)
-    # ========================================================================
-
-    # Email 4: Email with attachment
-    send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Report attached",
-        body="""Hi,
+REPORT_BODY = """Hi,
 
 Please find the weekly report attached.
 
 Best,
-Bob""",
-        attachments=[
-            ("weekly_report.txt", "Weekly Report\n==============\n\nMetrics:\n- Users: 1,234\n- Revenue: $50,000\n- Growth: 15%\n", "text/plain")
-        ],
-        hours_ago=28,
-    )
+Bob"""
 
-    # ========================================================================
-    # Urgent Email (5)
-    # ========================================================================
-
-    # Email 5: Urgent flag-worthy email
-    send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="URGENT: Server issue",
-        body="""Hi,
+SERVER_ISSUE_BODY = """Hi,
 
 The production server is showing high CPU usage. Can you take a look?
 
@@ -171,20 +206,9 @@ The production server is showing high CPU usage. Can you take a look?
 - Started: 10 minutes ago
 
 Thanks,
-Alice""",
-        hours_ago=24,
-    )
-
-    # ========================================================================
-    # Newsletter & Automated Emails (6, 10)
-    # ========================================================================
+Alice"""
 
-    # Email 6: Newsletter-style
-    send_email(
-        from_addr="newsletter@example.com",
-        to_addr="demo@example.com",
-        subject="Weekly Digest - Jan 2025",
-        body="""Weekly Digest
+DIGEST_JAN_BODY = """Weekly Digest
 =============
 
 Top Stories:
@@ -194,40 +218,15 @@ Top Stories:
 
 That's all for this week!
 
-- The Newsletter Team""",
-        hours_ago=22,
-    )
+- The Newsletter Team"""
 
-    # ========================================================================
-    # Thread Replies (7, 9, 14)
-    # ========================================================================
-
-    # Email 7: First reply in Q1 thread
-    q1_reply1_id = send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Re: Q1 Project Update",
-        body="""Following up on the project update.
+Q1_REPLY1_BODY = """Following up on the project update.
 
 Do you have any concerns about the Phase 2 timeline?
 
-Bob""",
-        in_reply_to=q1_id,
-        references=[q1_id],
-        message_id_key="q1_reply1",
-        hours_ago=20,
-    )
-
-    # ========================================================================
-    # New Senders (8, 12, 15, 16)
-    # ========================================================================
+Bob"""
 
-    # Email 8: Invoice from Charlie
-    send_email(
-        from_addr="charlie@example.com",
-        to_addr="demo@example.com",
-        subject="Invoice #12345",
-        body="""Hi,
+INVOICE_BODY = """Hi,
 
 Please find Invoice #12345 attached for services rendered in December.
 
@@ -239,30 +238,14 @@ Please remit payment via bank transfer to the account on file.
 
 Thanks,
 Charlie
-Acme Consulting LLC""",
-        hours_ago=18,
-    )
+Acme Consulting LLC"""
 
-    # Email 9: Meeting reply (proper threading)
-    send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="Re: Meeting tomorrow?",
-        body="""Perfect, let's do 2pm. I've sent a calendar invite.
+MEETING_REPLY_BODY = """Perfect, let's do 2pm. I've sent a calendar invite.
 
 Looking forward to it!
-Alice""",
-        in_reply_to=meeting_id,
-        references=[meeting_id],
-        hours_ago=16,
-    )
+Alice"""
 
-    # Email 10: Another newsletter
-    send_email(
-        from_addr="newsletter@example.com",
-        to_addr="demo@example.com",
-        subject="Weekly Digest - Feb 2025",
-        body="""Weekly Digest
+DIGEST_FEB_BODY = """Weekly Digest
 =============
 
 This Week's Highlights:
@@ -273,32 +256,18 @@ This Week's Highlights:
 
 Don't forget: Town hall meeting this Friday at 3pm!
 
-- The Newsletter Team""",
-        hours_ago=14,
-    )
+- The Newsletter Team"""
 
-    # Email 11: Different topic from Bob
-    send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Vacation request",
-        body="""Hey,
+VACATION_BODY = """Hey,
 
 I'm planning to take some time off next month. Would Feb 15-22 work?
 
 Let me know if there are any conflicts with the project timeline.
 
 Thanks,
-Bob""",
-        hours_ago=12,
-    )
+Bob"""
 
-    # Email 12: Support ticket style
-    send_email(
-        from_addr="support@example.com",
-        to_addr="demo@example.com",
-        subject="Your ticket #1001 has been updated",
-        body="""Your support ticket has been updated.
+TICKET_BODY = """Your support ticket has been updated.
 
 Ticket #: 1001
 Status: In Progress
@@ -312,16 +281,9 @@ You can reply to this email to add more information to your ticket.
 
 ---
 Example Support Team
-support.example.com""",
-        hours_ago=10,
-    )
+support.example.com"""
 
-    # Email 13: FYI-style email
-    send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="FYI: Policy changes",
-        body="""Hey,
+POLICY_FYI_BODY = """Hey,
 
 Just a heads up - there are some new security policies going into effect
 next week:
@@ -332,32 +294,16 @@ next week:
 
 Full details in the wiki. Let me know if you have questions.
 
-Alice""",
-        hours_ago=8,
-    )
+Alice"""
 
-    # Email 14: Deeper thread (third message in Q1 thread)
-    send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Re: Re: Q1 Project Update",
-        body="""Actually, I just talked to the team and we might be able
+Q1_REPLY2_BODY = """Actually, I just talked to the team and we might be able
 to finish Phase 2 early if we can get additional resources.
 
 Should we schedule a call to discuss?
 
-Bob""",
-        in_reply_to=q1_reply1_id,
-        references=[q1_id, q1_reply1_id],
-        hours_ago=6,
-    )
+Bob"""
 
-    # Email 15: HR-style
-    send_email(
-        from_addr="hr@example.com",
-        to_addr="demo@example.com",
-        subject="Important: Benefits enrollment deadline",
-        body="""Dear Employee,
+BENEFITS_BODY = """Dear Employee,
 
 This is a reminder that the annual benefits enrollment period ends on
 January 31, 2025.
@@ -371,16 +317,9 @@ If you have questions, please contact hr@example.com or visit the
 benefits FAQ in the employee handbook.
 
 Best regards,
-Human Resources""",
-        hours_ago=5,
-    )
+Human Resources"""
 
-    # Email 16: Leadership comms
-    send_email(
-        from_addr="ceo@example.com",
-        to_addr="demo@example.com",
-        subject="Company update",
-        body="""Team,
+COMPANY_UPDATE_BODY = """Team,
 
 I wanted to share some exciting news about our company's progress.
 
@@ -396,29 +335,13 @@ Looking forward to an even better Q2!
 
 Best,
 Jane Smith
-CEO""",
-        hours_ago=4,
-    )
+CEO"""
 
-    # Email 17: Short email
-    send_email(
-        from_addr="alice@example.com",
-        to_addr="demo@example.com",
-        subject="Quick question",
-        body="""Hey, are you around for a 5-min chat? Need your input on something.
+QUICK_QUESTION_BODY = """Hey, are you around for a 5-min chat? Need your input on something.
 
--A""",
-        hours_ago=2,
-    )
+-A"""
 
-    # Email 18: With spreadsheet attachment
-    # Create a minimal mock XLSX file (just headers to simulate)
-    xlsx_mock = b"PK\x03\x04MOCK_XLSX_CONTENT_FOR_DEMO"  # Not a real xlsx, but works for testing
-    send_email(
-        from_addr="bob@example.com",
-        to_addr="demo@example.com",
-        subject="Budget spreadsheet",
-        body="""Hi,
+BUDGET_BODY = """Hi,
 
 Attached is the Q1 budget spreadsheet for your review.
 
@@ -432,14 +355,228 @@ Total: $900K
 
 Let me know if you have any questions.
 
-Bob""",
-        attachments=[
-            ("q1_budget.xlsx", xlsx_mock, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        ],
+Bob"""
+
+
+# Replies must come after the messages they reference
+SPECS = (
+    # ========================================================================
+    # Basic Emails (1-3)
+    # ========================================================================
+
+    # Email 1: Simple message from Alice
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="Welcome to the team!",
+        body=WELCOME_BODY,
+        message_id_key="welcome",
+        hours_ago=48,
+    ),
+
+    # Email 2: Project update from Bob (thread starter)
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Q1 Project Update",
+        body=Q1_UPDATE_BODY,
+        message_id_key="q1_update",
+        hours_ago=36,
+    ),
+
+    # Email 3: Meeting request (thread starter)
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="Meeting tomorrow?",
+        body=MEETING_BODY,
+        message_id_key="meeting",
+        hours_ago=30,
+    ),
+
+    # ========================================================================
+    # Emails with Attachments (4, 18)
+    # ========================================================================
+
+    # Email 4: Email with attachment
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Report attached",
+        body=REPORT_BODY,
+        attachments=(
+            ("weekly_report.txt", b"Weekly Report\n==============\n\nMetrics:\n- Users: 1,234\n- Revenue: $50,000\n- Growth: 15%\n", "text/plain"),
+        ),
+        hours_ago=28,
+    ),
+
+    # ========================================================================
+    # Urgent Email (5)
+    # ========================================================================
+
+    # Email 5: Urgent flag-worthy email
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="URGENT: Server issue",
+        body=SERVER_ISSUE_BODY,
+        hours_ago=24,
+    ),
+
+    # ========================================================================
+    # Newsletter & Automated Emails (6, 10)
+    # ========================================================================
+
+    # Email 6: Newsletter-style
+    EmailSpec(
+        from_addr=NEWSLETTER,
+        to_addr=DEMO,
+        subject="Weekly Digest - Jan 2025",
+        body=DIGEST_JAN_BODY,
+        hours_ago=22,
+    ),
+
+    # ========================================================================
+    # Thread Replies (7, 9, 14)
+    # ========================================================================
+
+    # Email 7: First reply in Q1 thread
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Re: Q1 Project Update",
+        body=Q1_REPLY1_BODY,
+        in_reply_to="q1_update",
+        references=("q1_update",),
+        message_id_key="q1_reply1",
+        hours_ago=20,
+    ),
+
+    # ========================================================================
+    # New Senders (8, 12, 15, 16)
+    # ========================================================================
+
+    # Email 8: Invoice from Charlie
+    EmailSpec(
+        from_addr=CHARLIE,
+        to_addr=DEMO,
+        subject="Invoice #12345",
+        body=INVOICE_BODY,
+        hours_ago=18,
+    ),
+
+    # Email 9: Meeting reply (proper threading)
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="Re: Meeting tomorrow?",
+        body=MEETING_REPLY_BODY,
+        in_reply_to="meeting",
+        references=("meeting",),
+        hours_ago=16,
+    ),
+
+    # Email 10: Another newsletter
+    EmailSpec(
+        from_addr=NEWSLETTER,
+        to_addr=DEMO,
+        subject="Weekly Digest - Feb 2025",
+        body=DIGEST_FEB_BODY,
+        hours_ago=14,
+    ),
+
+    # Email 11: Different topic from Bob
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Vacation request",
+        body=VACATION_BODY,
+        hours_ago=12,
+    ),
+
+    # Email 12: Support ticket style
+    EmailSpec(
+        from_addr=SUPPORT,
+        to_addr=DEMO,
+        subject="Your ticket #1001 has been updated",
+        body=TICKET_BODY,
+        hours_ago=10,
+    ),
+
+    # Email 13: FYI-style email
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="FYI: Policy changes",
+        body=POLICY_FYI_BODY,
+        hours_ago=8,
+    ),
+
+    # Email 14: Deeper thread (third message in Q1 thread)
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Re: Re: Q1 Project Update",
+        body=Q1_REPLY2_BODY,
+        in_reply_to="q1_reply1",
+        references=("q1_update", "q1_reply1"),
+        hours_ago=6,
+    ),
+
+    # Email 15: HR-style
+    EmailSpec(
+        from_addr=HR,
+        to_addr=DEMO,
+        subject="Important: Benefits enrollment deadline",
+        body=BENEFITS_BODY,
+        hours_ago=5,
+    ),
+
+    # Email 16: Leadership comms
+    EmailSpec(
+        from_addr=CEO,
+        to_addr=DEMO,
+        subject="Company update",
+        body=COMPANY_UPDATE_BODY,
+        hours_ago=4,
+    ),
+
+    # Email 17: Short email
+    EmailSpec(
+        from_addr=ALICE,
+        to_addr=DEMO,
+        subject="Quick question",
+        body=QUICK_QUESTION_BODY,
+        hours_ago=2,
+    ),
+
+    # Email 18: With spreadsheet attachment
+    EmailSpec(
+        from_addr=BOB,
+        to_addr=DEMO,
+        subject="Budget spreadsheet",
+        body=BUDGET_BODY,
+        attachments=(
+            ("q1_budget.xlsx", XLSX_MOCK, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+        ),
         hours_ago=1,
-    )
+    ),
+)
+
+
+def main():
+    print("Sending test emails...")
+
+    # CPU-bound MIME construction happens once, up front; the pool only does I/O
+    messages = [build_message(spec) for spec in SPECS]
+    # Collected per send and written in one go, not a print per message
+    log: list[str] = []
+    try:
+        asyncio.run(send_all(messages, log))
+    finally:
+        sys.stdout.write("".join(line + "\n" for line in log))
 
-    print("\nDone! 18 test emails sent to demo@example.com")
+    print(f"\nDone! {len(SPECS)} test emails sent to demo@example.com")
     print("  - 3 emails in the Q1 Project thread")
     print("  - 2 emails in the Meeting thread")
     print("  - 2 emails with attachments")
@@ -6,19 +6,22 @@ thin adapters on top.
 """
 
 import asyncio
+import email.utils
 import hashlib
 import html
 import json
 import re
 import secrets
 import sys
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from .cache import Cache, get_cache
 from .config import ClerkConfig, ensure_dirs, get_config
 from .drafts import DraftManager, get_draft_manager
-from .imap_client import get_imap_client
+from .imap_client import close_imap_connections, get_imap_client
 from .models import (
     Address,
     CacheStats,
@@ -88,6 +91,10 @@ def draft_content_hash(draft: Draft) -> str:
 SEND_TOKEN_TTL_SECONDS = 300
 _SEND_TOKEN_PREFIX = "send_token:"
 
+# How long get_status waits on the account probes; IMAP sockets have no
+# timeout of their own, so one unresponsive server would otherwise hang it
+STATUS_PROBE_TIMEOUT_S = 10.0
+
 
 class ClerkAPI:
     """Unified API for clerk email operations.
@@ -107,6 +114,16 @@ class ClerkAPI:
         self._cache = cache
         self._draft_manager = draft_manager
 
+    def close(self) -> None:
+        """Log out the pooled IMAP sessions opened by this process."""
+        close_imap_connections()
+
+    def __enter__(self) -> "ClerkAPI":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
     @property
     def config(self) -> ClerkConfig:
         if self._config is None:
@@ -129,47 +146,114 @@ class ClerkAPI:
     # Inbox & Message Operations
     # =========================================================================
 
-    def _ensure_body(self, msg: Message, fresh: bool) -> None:
-        """Fetch the body from IMAP if the cache has none or is stale.
+    def _ensure_bodies(self, messages: list[Message], fresh: bool) -> None:
+        """Fetch missing or stale bodies, one IMAP session per (account, folder).
 
         Cache hit with body_text=None is only trusted if body_fetched_at was
         recent — otherwise the fetch is retried. Prevents the "None-forever"
         cache bug.
         """
-        needs_fetch = msg.body_text is None and (
-            fresh
-            or not self.cache.is_fresh(
-                msg.message_id,
-                self.config.cache.body_freshness_min,
-                check_body=True,
-            )
-        )
-        if not needs_fetch:
-            return
+        missing = [msg for msg in messages if msg.body_text is None]
+        if missing and not fresh:
+            # The cached row already carries body_html and body_fetched_at,
+            # so staleness is decided without a second query.
+            cutoff = datetime.now(UTC) - timedelta(minutes=self.config.cache.body_freshness_min)
+            missing = [
+                msg
+                for msg in missing
+                if msg.body_html is None
+                or msg.body_fetched_at is None
+                or msg.body_fetched_at <= cutoff
+            ]
+
+        groups: dict[tuple[str, str], list[Message]] = {}
+        for msg in missing:
+            groups.setdefault((msg.account, msg.folder), []).append(msg)
+
+        for (account, folder), group in groups.items():
+            with get_imap_client(account) as client:
+                fetched = client.fetch_message_bodies(
+                    folder, [msg.message_id for msg in group]
+                )
 
-        with get_imap_client(msg.account) as client:
-            body_text, body_html = client.fetch_message_body(msg.folder, msg.message_id)
-            if body_text is None and body_html:
-                body_text = html_to_text(body_html)
-            self.cache.update_body(msg.message_id, body_text, body_html)
-            msg.body_text = body_text
-            msg.body_html = body_html
+            bodies: dict[str, tuple[str | None, str | None]] = {}
+            for msg in group:
+                body_text, body_html = fetched.get(msg.message_id, (None, None))
+                if body_text is None and body_html:
+                    body_text = html_to_text(body_html)
+                bodies[msg.message_id] = (body_text, body_html)
+                msg.body_text = body_text
+                msg.body_html = body_html
+            self.cache.update_bodies(bodies)
 
     def get_conversation(
         self, conv_id: str, fresh: bool = False
     ) -> Conversation | None:
         """Get a conversation by ID, fetching bodies as needed."""
         conv = self.cache.get_conversation(conv_id)
+        if conv and fresh and self._sync_server_thread(conv):
+            conv = self.cache.get_conversation(conv.conv_id)
         if conv:
-            for msg in conv.messages:
-                self._ensure_body(msg, fresh)
+            self._ensure_bodies(conv.messages, fresh)
         return conv
 
+    def _sync_server_thread(self, conv: Conversation) -> bool:
+        """Pull thread members the cache is missing using server-side threading.
+
+        Gmail (X-GM-EXT-1) resolves the whole thread from All Mail; servers
+        with RFC 5256 THREAD get one THREAD call per folder the conversation
+        spans. Anything else keeps the plain cache view. Returns True if
+        messages were stored or regrouped into the conversation.
+        """
+        header_ids = [
+            m.message_id for m in conv.messages if not re.match(r"<\d+@local>", m.message_id)
+        ]
+        if not header_ids:
+            return False
+        account = conv.messages[0].account
+
+        with get_imap_client(account) as client:
+            if client.has_capability("X-GM-EXT-1"):
+                thread = client.fetch_gmail_thread(header_ids[0])
+            elif client.has_capability("THREAD=REFERENCES") or client.has_capability(
+                "THREAD=REFS"
+            ):
+                thread = []
+                folders = {m.folder for m in conv.messages if m.account == account}
+                for folder in sorted(folders):
+                    thread += client.fetch_referenced_thread(folder, header_ids)
+            else:
+                return False
+
+        known = {m.message_id for m in conv.messages}
+        # Members cached under another conversation keep their row: storing
+        # the thread copy would move them to the folder it was fetched from
+        # (All Mail on Gmail) and drop their cached flags.
+        cached = self.cache.get_folders([m.message_id for m in thread])
+        regrouped: list[str] = []
+        new_messages = []
+        for msg in thread:
+            # The same message can turn up in more than one folder
+            if msg.message_id in known:
+                continue
+            known.add(msg.message_id)
+            # The server's thread is authoritative, even where headers disagree
+            if msg.message_id in cached:
+                regrouped.append(msg.message_id)
+                continue
+            msg.conv_id = conv.conv_id
+            if msg.body_text is None and msg.body_html:
+                msg.body_text = html_to_text(msg.body_html)
+            new_messages.append(msg)
+        self.cache.set_conv_id(regrouped, conv.conv_id)
+        self.cache.store_messages(new_messages)
+        return bool(regrouped or new_messages)
+
     def get_message(self, message_id: str, fresh: bool = False) -> Message | None:
         """Get a single message by ID, fetching body as needed."""
         msg = self.cache.get_message(message_id)
         if msg:
-            self._ensure_body(msg, fresh)
+            self._ensure_bodies([msg], fresh)
         return msg
 
     # =========================================================================
@@ -191,7 +275,8 @@ class ClerkAPI:
         def to_address(a: str | Address) -> Address:
             if isinstance(a, Address):
                 return a
-            return Address(addr=a.strip(), name="")
+            name, addr = email.utils.parseaddr(a)
+            return Address(addr=addr or a.strip(), name=name)
 
         to_addrs = [to_address(a) for a in to]
         cc_addrs = [to_address(a) for a in (cc or [])]
@@ -338,6 +423,10 @@ class ClerkAPI:
         Enforces: persistent rate limit (from ``send_log``), blocked recipients,
         and draft/account match. Used by both the API send path and MCP's
         two-step preview.
+
+        Not memoized per draft: a send between preview and confirm changes
+        the rate-limit count, so a cached "allowed" could overshoot the
+        limit. The count is a single indexed lookup.
         """
         send_config = self.config.send
 
@@ -440,8 +529,8 @@ class ClerkAPI:
         """
         account_name, _ = self.config.get_account(account)
 
-        msg = self.cache.get_message(message_id)
-        folder = msg.folder if msg else "INBOX"
+        cached_folder = self.cache.get_folder(message_id)
+        folder = cached_folder or "INBOX"
 
         with get_imap_client(account_name) as client:
             if on:
@@ -449,15 +538,9 @@ class ClerkAPI:
             else:
                 client.remove_flags(folder, message_id, [flag])
 
-        if msg:
+        if cached_folder is not None:
             try:
-                if on:
-                    flags = list(msg.flags)
-                    if flag not in flags:
-                        flags.append(flag)
-                else:
-                    flags = [f for f in msg.flags if f != flag]
-                self.cache.update_flags(message_id, flags)
+                self.cache.set_flag(message_id, flag, on)
             except Exception as e:
                 print(
                     f"Warning: cache update failed after IMAP flag change "
@@ -465,6 +548,41 @@ class ClerkAPI:
                     file=sys.stderr,
                 )
 
+    def set_flag_many(
+        self,
+        message_ids: list[str],
+        flag: MessageFlag,
+        on: bool,
+        account: str | None = None,
+    ) -> None:
+        """Add or remove a flag on many messages: one STORE per folder.
+
+        Same server-first contract as set_flag(). Messages missing from the
+        cache are assumed to be in INBOX.
+        """
+        account_name, _ = self.config.get_account(account)
+
+        cached_folders = self.cache.get_folders(message_ids)
+        by_folder: dict[str, list[str]] = {}
+        for message_id in message_ids:
+            by_folder.setdefault(cached_folders.get(message_id, "INBOX"), []).append(message_id)
+
+        with get_imap_client(account_name) as client:
+            for folder, ids in by_folder.items():
+                if on:
+                    client.add_flags_many(folder, ids, [flag])
+                else:
+                    client.remove_flags_many(folder, ids, [flag])
+
+        try:
+            self.cache.set_flag_many(list(cached_folders), flag, on)
+        except Exception as e:
+            print(
+                f"Warning: cache update failed after IMAP flag change "
+                f"({flag.value}={on}): {e}. Will self-heal on next sync.",
+                file=sys.stderr,
+            )
+
     def mark_read(self, message_id: str, account: str | None = None) -> None:
         """Mark a message as read."""
         self.set_flag(message_id, MessageFlag.SEEN, True, account=account)
@@ -473,6 +591,10 @@ class ClerkAPI:
         """Mark a message as unread."""
         self.set_flag(message_id, MessageFlag.SEEN, False, account=account)
 
+    def mark_read_many(self, message_ids: list[str], account: str | None = None) -> None:
+        """Mark many messages as read."""
+        self.set_flag_many(message_ids, MessageFlag.SEEN, True, account=account)
+
     def flag_message(self, message_id: str, account: str | None = None) -> None:
         """Flag/star a message."""
         self.set_flag(message_id, MessageFlag.FLAGGED, True, account=account)
@@ -503,6 +625,28 @@ class ClerkAPI:
                 file=sys.stderr,
             )
 
+    def move_messages(
+        self,
+        message_ids: list[str],
+        to_folder: str,
+        from_folder: str = "INBOX",
+        account: str | None = None,
+    ) -> None:
+        """Move many messages in one IMAP session (server-first, cache best-effort)."""
+        account_name, _ = self.config.get_account(account)
+
+        with get_imap_client(account_name) as client:
+            client.move_messages(message_ids, from_folder, to_folder)
+
+        try:
+            self.cache.move_messages(message_ids, to_folder)
+        except Exception as e:
+            print(
+                f"Warning: cache update failed after IMAP move to {to_folder}: "
+                f"{e}. Will self-heal on next sync.",
+                file=sys.stderr,
+            )
+
     def archive_message(self, message_id: str, account: str | None = None) -> None:
         """Archive a message (server-first, cache best-effort)."""
         account_name, _ = self.config.get_account(account)
@@ -542,54 +686,95 @@ class ClerkAPI:
         account: str | None = None,
         folder: str = "INBOX",
         full: bool = False,
+        prefetch_bodies: int = 0,
     ) -> dict[str, Any]:
         """Sync a folder from IMAP, fetching only new messages.
 
+        With ``prefetch_bodies`` > 0, bodies of that many of the newest
+        synced messages are fetched on a background thread after returning,
+        so a follow-up read usually hits a warm cache. The thread is a
+        daemon and is never joined, so the prefetch is best-effort: it only
+        pays off in a long-lived process like the MCP server, and a
+        short-lived caller (the CLI ``sync`` command leaves it at 0) could
+        exit before it finishes.
+
+        On CONDSTORE servers the sync also pulls flag changes on already
+        cached messages (``CHANGEDSINCE`` the last HIGHESTMODSEQ), and a
+        changed UIDVALIDITY restarts from scratch since old UIDs are void.
+
         Advances sync state only when store succeeds; on store failure the
         sync state is left alone so the next sync retries the same UIDs.
         """
         account_name, _ = self.config.get_account(account)
 
-        since_uid = 0
-        if not full:
-            state = self.cache.get_sync_state(account_name, folder)
-            if state:
-                since_uid = state["last_uid"]
+        state = self.cache.get_sync_state(account_name, folder)
+        since_uid = state["last_uid"] if state and not full else 0
+        uidvalidity: int | None = None
+        highest_modseq: int | None = None
+        flag_changes: dict[str, list[MessageFlag]] = {}
 
         with get_imap_client(account_name) as client:
+            condstore = client.has_capability("CONDSTORE")
+            if condstore:
+                uidvalidity, highest_modseq = client.get_folder_state(folder)
+                if state and state["uidvalidity"] not in (None, uidvalidity):
+                    since_uid = 0
+
             messages, highest_uid = client.fetch_messages_since_uid(
                 folder=folder,
                 since_uid=since_uid,
                 fetch_bodies=False,
             )
 
-            for msg in messages:
-                self.cache.store_message(msg)
+            last_modseq = state["highest_modseq"] if state and since_uid else None
+            if condstore and last_modseq and highest_modseq and highest_modseq > last_modseq:
+                flag_changes = client.fetch_flag_changes(folder, since_uid, last_modseq)
 
-        if highest_uid > since_uid:
-            self.cache.set_sync_state(account_name, folder, highest_uid)
+            self.cache.store_messages(messages)
+            if flag_changes:
+                self.cache.update_flags_many(flag_changes)
+
+        if highest_uid > since_uid or condstore:
+            self.cache.set_sync_state(
+                account_name, folder, highest_uid, uidvalidity, highest_modseq
+            )
 
         # Only mark the folder as "freshly synced" when we actually saw the
         # server (not on partial-fetch failure before store). Storing above
         # is inside the `with` block; reaching here means it completed.
         self.cache.mark_inbox_synced(account_name)
 
+        if prefetch_bodies > 0 and messages:
+            newest = sorted(messages, key=lambda m: m.date, reverse=True)[:prefetch_bodies]
+            threading.Thread(target=self._prefetch_bodies, args=(newest,), daemon=True).start()
+
         return {
             "synced": len(messages),
+            "flags_updated": len(flag_changes),
             "account": account_name,
             "folder": folder,
             "last_uid": highest_uid,
         }
 
+    def _prefetch_bodies(self, messages: list[Message]) -> None:
+        """Warm the body cache off the request path; failures only warn."""
+        try:
+            self._ensure_bodies(messages, fresh=False)
+        except Exception as e:
+            print(f"Warning: body prefetch failed: {e}", file=sys.stderr)
+
     def sync_all(
-        self, folder: str = "INBOX", full: bool = False
+        self, folder: str = "INBOX", full: bool = False, prefetch_bodies: int = 0
     ) -> dict[str, Any]:
         """Sync the given folder across all configured accounts."""
         results: dict[str, Any] = {"accounts": {}, "total_synced": 0}
         for acct_name in self.config.accounts:
             try:
                 result = self.sync_folder(
-                    account=acct_name, folder=folder, full=full
+                    account=acct_name,
+                    folder=folder,
+                    full=full,
+                    prefetch_bodies=prefetch_bodies,
                 )
                 results["accounts"][acct_name] = result
                 results["total_synced"] += result["synced"]
@@ -616,21 +801,44 @@ class ClerkAPI:
             "accounts": {},
         }
 
+        # Each probe is connect + auth + LIST; run them side by side so the
+        # wall time is the slowest account, not the sum of all of them.
+        # Daemon threads: a probe stuck in a socket read must not hold up
+        # interpreter exit the way a joined executor worker would.
+        results: dict[str, dict[str, Any]] = {}
+
+        def probe(name: str) -> None:
+            results[name] = self._probe_account(name)[1]
+
+        threads = [
+            threading.Thread(target=probe, args=(name,), name=f"clerk-status-{name}", daemon=True)
+            for name in self.config.accounts
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + STATUS_PROBE_TIMEOUT_S
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
         for name in self.config.accounts:
-            try:
-                with get_imap_client(name) as client:
-                    status["accounts"][name] = {
-                        "connected": True,
-                        "folders": len(client.list_folders()),
-                    }
-            except Exception as e:
-                status["accounts"][name] = {
-                    "connected": False,
-                    "error": str(e),
-                }
+            status["accounts"][name] = results.get(name, {"connected": False, "error": "timeout"})
 
         return status
 
+    def _probe_account(self, name: str) -> tuple[str, dict[str, Any]]:
+        """Open a connection to one account and report its health."""
+        try:
+            with get_imap_client(name) as client:
+                return name, {
+                    "connected": True,
+                    "folders": len(client.list_folders()),
+                }
+        except Exception as e:
+            return name, {
+                "connected": False,
+                "error": str(e),
+            }
+
 
 # Singleton instance
 _api_instance: ClerkAPI | None = None
@@ -1,15 +1,20 @@
 """SQLite cache with FTS5 for message storage and search."""
 
-import json
+import atexit
 import re
 import sqlite3
-from collections.abc import Iterator, Sequence
+import sys
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-from .config import get_data_dir
+import orjson
+from pydantic import TypeAdapter
+
+from .config import get_config, get_data_dir
 from .models import (
     Address,
     Attachment,
@@ -24,6 +29,27 @@ from .models import (
 # prefixes so they cannot inject SQL LIKE wildcards (%, _, \).
 _CONV_ID_PREFIX_RE = re.compile(r"^[0-9a-f]{1,12}$")
 
+# How long a connection waits on another writer's lock before SQLITE_BUSY.
+# A full sync in one process can hold the write lock for a while; the
+# sqlite3 default of 5s made a concurrent CLI command fail spuriously.
+BUSY_TIMEOUT_S = 30.0
+
+# Batches at least this large shift the data distribution enough to refresh
+# the planner statistics (sqlite_stat1) straight away.
+ANALYZE_AFTER_ROWS = 1000
+
+
+def _dumps(value: Any) -> str:
+    """Encode a JSON column. orjson returns bytes, which SQLite would store as a BLOB."""
+    return orjson.dumps(value).decode()
+
+
+# Address and attachment lists are encoded by pydantic's serializer in one
+# pass instead of model_dump() per item followed by a separate JSON encode.
+_ADDRESS_LIST = TypeAdapter(list[Address])
+_ATTACHMENT_LIST = TypeAdapter(list[Attachment])
+
+
 SCHEMA = """
 -- Core message storage
 CREATE TABLE IF NOT EXISTS messages (
@@ -41,52 +67,102 @@ CREATE TABLE IF NOT EXISTS messages (
     subject TEXT DEFAULT '',
     date_utc TEXT NOT NULL,
 
-    body_text TEXT,
-    body_html TEXT,
-
     flags TEXT DEFAULT '[]',
+    -- Denormalized from flags so unread counts are integer sums
+    is_unread INTEGER NOT NULL DEFAULT 1,
     attachments_json TEXT DEFAULT '[]',
 
     in_reply_to TEXT,
     references_json TEXT DEFAULT '[]',
 
-    headers_fetched_at TEXT NOT NULL,
-    body_fetched_at TEXT
+    headers_fetched_at TEXT NOT NULL
+);
+
+-- Bodies live apart from headers so listing scans stay on small rows.
+-- JOIN on message_id when the text is needed.
+CREATE TABLE IF NOT EXISTS message_bodies (
+    message_id TEXT PRIMARY KEY,
+    body_text TEXT,
+    body_html TEXT,
+    fetched_at TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_messages_conv ON messages(conv_id);
 CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(date_utc DESC);
 CREATE INDEX IF NOT EXISTS idx_messages_from ON messages(from_addr);
-CREATE INDEX IF NOT EXISTS idx_messages_folder ON messages(folder);
 CREATE INDEX IF NOT EXISTS idx_messages_account ON messages(account);
-
--- Full-text search on cached content
+-- Listings filter on folder (and usually account), then group by conv_id.
+-- With conv_id next, the groups stream straight off the index and only the
+-- per-conversation rows get sorted by date. Also serves folder-only
+-- lookups, so it replaces the single-column idx_messages_folder.
+CREATE INDEX IF NOT EXISTS idx_messages_folder_account_conv
+    ON messages(folder, account, conv_id, date_utc);
+DROP INDEX IF EXISTS idx_messages_folder;
+DROP INDEX IF EXISTS idx_messages_folder_account_date;
+CREATE INDEX IF NOT EXISTS idx_messages_unread ON messages(conv_id) WHERE is_unread = 1;
+
+-- Full-text search on cached content (headers joined with bodies)
+CREATE VIEW IF NOT EXISTS messages_fts_source AS
+SELECT m.rowid AS rowid, m.message_id, m.subject, b.body_text, m.from_name, m.from_addr
+FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.message_id;
+
+-- prefix='2 3' keeps 2- and 3-character prefix indexes, so prefix queries
+-- (alic*, budg*) read a posting list instead of scanning the term range
 CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
     message_id,
     subject,
     body_text,
     from_name,
     from_addr,
-    content=messages,
-    content_rowid=rowid
+    content=messages_fts_source,
+    content_rowid=rowid,
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
 );
 
 -- Triggers to keep FTS in sync
 CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
     INSERT INTO messages_fts(rowid, message_id, subject, body_text, from_name, from_addr)
-    VALUES (new.rowid, new.message_id, new.subject, new.body_text, new.from_name, new.from_addr);
+    VALUES (new.rowid, new.message_id, new.subject,
+            (SELECT body_text FROM message_bodies WHERE message_id = new.message_id),
+            new.from_name, new.from_addr);
 END;
 
 CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
     INSERT INTO messages_fts(messages_fts, rowid, message_id, subject, body_text, from_name, from_addr)
-    VALUES ('delete', old.rowid, old.message_id, old.subject, old.body_text, old.from_name, old.from_addr);
+    VALUES ('delete', old.rowid, old.message_id, old.subject,
+            (SELECT body_text FROM message_bodies WHERE message_id = old.message_id),
+            old.from_name, old.from_addr);
+    DELETE FROM message_bodies WHERE message_id = old.message_id;
 END;
 
 CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
     INSERT INTO messages_fts(messages_fts, rowid, message_id, subject, body_text, from_name, from_addr)
-    VALUES ('delete', old.rowid, old.message_id, old.subject, old.body_text, old.from_name, old.from_addr);
+    VALUES ('delete', old.rowid, old.message_id, old.subject,
+            (SELECT body_text FROM message_bodies WHERE message_id = old.message_id),
+            old.from_name, old.from_addr);
     INSERT INTO messages_fts(rowid, message_id, subject, body_text, from_name, from_addr)
-    VALUES (new.rowid, new.message_id, new.subject, new.body_text, new.from_name, new.from_addr);
+    VALUES (new.rowid, new.message_id, new.subject,
+            (SELECT body_text FROM message_bodies WHERE message_id = new.message_id),
+            new.from_name, new.from_addr);
+END;
+
+CREATE TRIGGER IF NOT EXISTS message_bodies_ai AFTER INSERT ON message_bodies BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, message_id, subject, body_text, from_name, from_addr)
+    SELECT 'delete', rowid, message_id, subject, NULL, from_name, from_addr
+    FROM messages WHERE message_id = new.message_id;
+    INSERT INTO messages_fts(rowid, message_id, subject, body_text, from_name, from_addr)
+    SELECT rowid, message_id, subject, new.body_text, from_name, from_addr
+    FROM messages WHERE message_id = new.message_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS message_bodies_au AFTER UPDATE ON message_bodies BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, message_id, subject, body_text, from_name, from_addr)
+    SELECT 'delete', rowid, message_id, subject, old.body_text, from_name, from_addr
+    FROM messages WHERE message_id = old.message_id;
+    INSERT INTO messages_fts(rowid, message_id, subject, body_text, from_name, from_addr)
+    SELECT rowid, message_id, subject, new.body_text, from_name, from_addr
+    FROM messages WHERE message_id = new.message_id;
 END;
 
 -- Draft storage (local only)
@@ -122,6 +198,8 @@ CREATE TABLE IF NOT EXISTS sync_state (
     folder TEXT NOT NULL,
     last_uid INTEGER DEFAULT 0,
     last_sync_utc TEXT NOT NULL,
+    uidvalidity INTEGER,
+    highest_modseq INTEGER,
     PRIMARY KEY (account, folder)
 );
 
@@ -136,54 +214,233 @@ CREATE TABLE IF NOT EXISTS send_log (
     subject TEXT NOT NULL,
     message_id TEXT
 );
+
+-- The rate limiter counts one account's sends over the last hour
+CREATE INDEX IF NOT EXISTS idx_send_log_account_ts ON send_log(account, timestamp);
+"""
+
+# Caches created before bodies moved to message_bodies: rebuild messages
+# without the body columns and let the triggers re-index FTS on the way in.
+_SPLIT_BODIES_SQL = """
+BEGIN;
+DROP TRIGGER IF EXISTS messages_ai;
+DROP TRIGGER IF EXISTS messages_ad;
+DROP TRIGGER IF EXISTS messages_au;
+DROP TABLE IF EXISTS messages_fts;
+DROP INDEX IF EXISTS idx_messages_conv;
+DROP INDEX IF EXISTS idx_messages_date;
+DROP INDEX IF EXISTS idx_messages_from;
+DROP INDEX IF EXISTS idx_messages_folder;
+DROP INDEX IF EXISTS idx_messages_account;
+DROP INDEX IF EXISTS idx_messages_unread;
+DROP INDEX IF EXISTS idx_messages_folder_account_conv;
+ALTER TABLE messages RENAME TO messages_unsplit;
+{schema}
+INSERT INTO messages (
+    message_id, conv_id, account, folder,
+    from_addr, from_name, to_json, cc_json, reply_to_json,
+    subject, date_utc, flags, is_unread, attachments_json, in_reply_to, references_json,
+    headers_fetched_at
+)
+SELECT
+    message_id, conv_id, account, folder,
+    from_addr, from_name, to_json, cc_json, reply_to_json,
+    subject, date_utc, flags, {unread_expr}, attachments_json, in_reply_to, references_json,
+    headers_fetched_at
+FROM messages_unsplit ORDER BY rowid;
+INSERT INTO message_bodies (message_id, body_text, body_html, fetched_at)
+SELECT message_id, body_text, body_html, body_fetched_at FROM messages_unsplit
+WHERE body_text IS NOT NULL OR body_html IS NOT NULL OR body_fetched_at IS NOT NULL;
+DROP TABLE messages_unsplit;
+COMMIT;
+"""
+
+# Backfills is_unread from the JSON flags of rows cached before the column existed
+_UNREAD_FROM_FLAGS = "NOT EXISTS (SELECT 1 FROM json_each(flags) WHERE value = 'seen')"
+
+# Message columns plus the body columns the Message model carries
+_MESSAGE_SELECT = """
+    SELECT m.*, b.body_text, b.body_html, b.fetched_at AS body_fetched_at
+    FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.message_id
+"""
+
+# Conversation reads only show body_text, so body_html (often far larger) is
+# carried only when there is no text; the body-freshness check relies on it then
+_CONVERSATION_SELECT = """
+    SELECT m.*, b.body_text,
+        CASE WHEN b.body_text IS NULL THEN b.body_html END AS body_html,
+        b.fetched_at AS body_fetched_at
+    FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.message_id
 """
 
 
 class Cache:
     """SQLite-based message cache with FTS5 support."""
 
-    def __init__(self, db_path: Path | None = None):
+    def __init__(self, db_path: Path | None = None, cache_size_mb: int = 64):
         if db_path is None:
             db_path = get_data_dir() / "cache.db"
         self.db_path = db_path
+        self.cache_size_mb = cache_size_mb
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
-        """Create database schema if not exists."""
+        """Create database schema if not exists.
+
+        WAL is persistent in the database file, so it only needs setting
+        here; it lets readers proceed while a sync is writing. page_size
+        only takes effect before the first table exists.
+        """
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Not a write block: executescript and VACUUM manage their own
+        # transactions, and nothing else can see this Cache yet.
         with self._connect() as conn:
+            conn.execute("PRAGMA page_size = 4096")
+            conn.execute("PRAGMA journal_mode = WAL")
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(messages)")}
+            if "body_text" in columns:
+                conn.executescript(
+                    _SPLIT_BODIES_SQL.format(schema=SCHEMA, unread_expr=_UNREAD_FROM_FLAGS)
+                )
+                # Reclaim the pages the inline bodies used to occupy
+                conn.execute("VACUUM")
+            elif columns and "is_unread" not in columns:
+                # Must exist before SCHEMA creates the partial index on it
+                conn.execute(
+                    "ALTER TABLE messages ADD COLUMN is_unread INTEGER NOT NULL DEFAULT 1"
+                )
+                conn.execute(f"UPDATE messages SET is_unread = {_UNREAD_FROM_FLAGS}")
+
+            # The tokenizer and prefix indexes are fixed at creation; re-create
+            # an index built with older options and re-index it from the
+            # content view.
+            fts = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'messages_fts'"
+            ).fetchone()
+            reindex = fts is not None and "prefix='2 3'" not in fts["sql"]
+            if reindex:
+                conn.execute("DROP TABLE messages_fts")
+
             conn.executescript(SCHEMA)
+            sync_columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_state)")}
+            for column in ("uidvalidity", "highest_modseq"):
+                if column not in sync_columns:
+                    conn.execute(f"ALTER TABLE sync_state ADD COLUMN {column} INTEGER")
+            if reindex:
+                conn.execute("INSERT INTO messages_fts(messages_fts) VALUES('rebuild')")
+
+    def _tune(self, conn: sqlite3.Connection) -> None:
+        """Apply per-connection performance PRAGMAs.
+
+        mmap and the page cache keep hot reads in memory. The database
+        itself deliberately stays on disk rather than in an in-memory copy
+        snapshotted back periodically: DraftManager and concurrent clerk
+        processes (the CLI next to a running MCP server) write the same
+        file, and a snapshot would silently overwrite their drafts and
+        send-log rows.
+        """
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size = -{self.cache_size_mb * 1024}")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # Sample at most ~1000 rows per index when ANALYZE / optimize run
+        conn.execute("PRAGMA analysis_limit = 1000")
+
+    def close(self) -> None:
+        """Refresh planner statistics and close this thread's connection.
+
+        ``PRAGMA optimize`` only re-analyzes tables whose statistics look
+        stale, so it is cheap enough to run on every shutdown.
+        """
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        try:
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
 
     @contextmanager
-    def _connect(self) -> Iterator[sqlite3.Connection]:
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Context manager for database connections.
+
+        Each thread keeps one open connection, so the PRAGMAs run once and
+        sqlite3's statement cache keeps the hot queries prepared across
+        calls. The connection is in autocommit mode: plain reads take no
+        transaction at all.
+
+        ``write=True`` blocks run in ``BEGIN IMMEDIATE`` so the write lock
+        is taken up front rather than upgraded mid-transaction (which can
+        fail with SQLITE_BUSY), and hold the in-process writer lock so
+        threads queue here instead of spinning in the busy handler. A write
+        block nested in another joins the outer transaction.
+        """
+        local = self._local
+        conn: sqlite3.Connection | None = getattr(local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT_S,
+                isolation_level=None,
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            self._tune(conn)
+            # Safe under WAL: a crash can lose the last commit, never corrupt
+            conn.execute("PRAGMA synchronous = NORMAL")
+            local.conn = conn
+
+        began = write and not conn.in_transaction
+        if began:
+            self._write_lock.acquire()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                self._write_lock.release()
+                raise
         try:
             yield conn
-            conn.commit()
+            if began:
+                conn.commit()
+        except BaseException:
+            if began:
+                conn.rollback()
+            raise
         finally:
-            conn.close()
+            if began:
+                self._write_lock.release()
 
     def _row_to_message(self, row: sqlite3.Row) -> Message:
-        """Convert a database row to a Message object."""
-        return Message(
+        """Convert a database row to a Message object.
+
+        As with summaries, every value was validated on the way in, so the
+        models are built with model_construct() rather than re-validated;
+        conversation reads build one Message (and its Addresses) per row.
+        """
+        return Message.model_construct(
             message_id=row["message_id"],
             conv_id=row["conv_id"],
-            account=row["account"],
-            folder=row["folder"],
-            **{"from": Address(addr=row["from_addr"], name=row["from_name"] or "")},
-            to=[Address(**a) for a in json.loads(row["to_json"])],
-            cc=[Address(**a) for a in json.loads(row["cc_json"])],
-            reply_to=[Address(**a) for a in json.loads(row["reply_to_json"])],
+            # A handful of distinct values repeat on every row; interning
+            # lets all the messages share one string for each
+            account=sys.intern(row["account"]),
+            folder=sys.intern(row["folder"]),
+            from_=Address.model_construct(addr=row["from_addr"], name=row["from_name"] or ""),
+            to=[Address.model_construct(**a) for a in orjson.loads(row["to_json"])],
+            cc=[Address.model_construct(**a) for a in orjson.loads(row["cc_json"])],
+            reply_to=[Address.model_construct(**a) for a in orjson.loads(row["reply_to_json"])],
             subject=row["subject"] or "",
             date=datetime.fromisoformat(row["date_utc"]),
             body_text=row["body_text"],
             body_html=row["body_html"],
-            flags=[MessageFlag(f) for f in json.loads(row["flags"])],
-            attachments=[Attachment(**a) for a in json.loads(row["attachments_json"])],
+            flags=[MessageFlag(f) for f in orjson.loads(row["flags"])],
+            attachments=[
+                Attachment.model_construct(**a) for a in orjson.loads(row["attachments_json"])
+            ],
             in_reply_to=row["in_reply_to"],
-            references=json.loads(row["references_json"]),
+            references=orjson.loads(row["references_json"]),
             headers_fetched_at=datetime.fromisoformat(row["headers_fetched_at"]),
             body_fetched_at=(
                 datetime.fromisoformat(row["body_fetched_at"])
@@ -192,47 +449,168 @@ class Cache:
             ),
         )
 
+    @staticmethod
+    def _row_to_summary(row: sqlite3.Row) -> ConversationSummary:
+        """Convert an aggregated conversation row to a summary.
+
+        Every field comes straight from our own schema, so pydantic
+        validation is skipped; listings build one of these per row.
+        """
+        return ConversationSummary.model_construct(
+            conv_id=row["conv_id"],
+            subject=row["subject"] or "(no subject)",
+            participants=row["participants"].split(",") if row["participants"] else [],
+            message_count=row["message_count"],
+            unread_count=row["unread_count"],
+            latest_date=datetime.fromisoformat(row["latest_date"]),
+            snippet=row["snippet"] or "",
+            account=sys.intern(row["account"]),
+        )
+
+    # Aggregate the conversations first (one page of them, when limited), then
+    # rank only their messages in a single window pass to pick each one's
+    # latest body as the snippet, instead of a correlated subquery per group.
+    # The snippet is cut in SQL so whole bodies never cross into Python.
+    # Participants are the five most recent distinct senders: summaries only
+    # display a few, and long threads made GROUP_CONCAT(DISTINCT) unbounded.
+    # Both CTEs apply {where}, so senders and the snippet come from the same
+    # folder/account scope as the counts; callers bind its parameters twice,
+    # with LIMIT's in between.
+    _SUMMARY_SQL = """
+        WITH convs AS (
+            SELECT
+                conv_id,
+                MAX(date_utc) as latest_date,
+                MIN(subject) as subject,
+                COUNT(*) as message_count,
+                SUM(is_unread) as unread_count,
+                MIN(account) as account
+            FROM messages
+            WHERE {where}
+            GROUP BY conv_id
+            ORDER BY latest_date DESC
+            {limit}
+        ),
+        latest AS (
+            SELECT
+                m.conv_id,
+                m.from_addr,
+                substr(b.body_text, 1, 100) as snippet,
+                ROW_NUMBER() OVER (
+                    PARTITION BY m.conv_id ORDER BY m.date_utc DESC
+                ) as rn
+            FROM (
+                SELECT conv_id, message_id, from_addr, date_utc FROM messages
+                WHERE {where} AND conv_id IN (SELECT conv_id FROM convs)
+            ) m
+            LEFT JOIN message_bodies b ON b.message_id = m.message_id
+        )
+        SELECT
+            convs.*,
+            latest.snippet,
+            (SELECT GROUP_CONCAT(from_addr) FROM (
+                SELECT l.from_addr FROM latest l
+                WHERE l.conv_id = convs.conv_id
+                GROUP BY l.from_addr
+                ORDER BY MIN(l.rn)
+                LIMIT 5
+            )) as participants
+        FROM convs
+        LEFT JOIN latest ON latest.conv_id = convs.conv_id AND latest.rn = 1
+        ORDER BY convs.latest_date DESC
+    """
+
+    _STORE_SQL = """
+        INSERT OR REPLACE INTO messages (
+            message_id, conv_id, account, folder,
+            from_addr, from_name, to_json, cc_json, reply_to_json,
+            subject, date_utc,
+            flags, is_unread, attachments_json, in_reply_to, references_json,
+            headers_fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Header-only stores (body_fetched_at unset) leave an existing body alone
+    _STORE_BODY_SQL = """
+        INSERT INTO message_bodies (message_id, body_text, body_html, fetched_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(message_id) DO UPDATE SET
+            body_text = excluded.body_text,
+            body_html = excluded.body_html,
+            fetched_at = excluded.fetched_at
+    """
+
+    # Same upsert, but only for messages that are cached
+    _UPDATE_BODY_SQL = """
+        INSERT INTO message_bodies (message_id, body_text, body_html, fetched_at)
+        SELECT message_id, ?, ?, ? FROM messages WHERE message_id = ?
+        ON CONFLICT(message_id) DO UPDATE SET
+            body_text = excluded.body_text,
+            body_html = excluded.body_html,
+            fetched_at = excluded.fetched_at
+    """
+
+    @staticmethod
+    def _message_params(msg: Message) -> tuple[Any, ...]:
+        """Bind parameters for ``_STORE_SQL``."""
+        return (
+            msg.message_id,
+            msg.conv_id,
+            msg.account,
+            msg.folder,
+            msg.from_.addr,
+            msg.from_.name,
+            _ADDRESS_LIST.dump_json(msg.to).decode(),
+            _ADDRESS_LIST.dump_json(msg.cc).decode(),
+            _ADDRESS_LIST.dump_json(msg.reply_to).decode(),
+            msg.subject,
+            msg.date.isoformat(),
+            _dumps([f.value for f in msg.flags]),
+            int(MessageFlag.SEEN not in msg.flags),
+            _ATTACHMENT_LIST.dump_json(msg.attachments).decode(),
+            msg.in_reply_to,
+            _dumps(msg.references),
+            (msg.headers_fetched_at or datetime.now(UTC)).isoformat(),
+        )
+
+    @staticmethod
+    def _body_params(msg: Message) -> tuple[Any, ...] | None:
+        """Bind parameters for ``_STORE_BODY_SQL``, or None if there is no body."""
+        if msg.body_text is None and msg.body_html is None and msg.body_fetched_at is None:
+            return None
+        return (
+            msg.message_id,
+            msg.body_text,
+            msg.body_html,
+            msg.body_fetched_at.isoformat() if msg.body_fetched_at else None,
+        )
+
     def store_message(self, msg: Message) -> None:
         """Store or update a message in the cache."""
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO messages (
-                    message_id, conv_id, account, folder,
-                    from_addr, from_name, to_json, cc_json, reply_to_json,
-                    subject, date_utc, body_text, body_html,
-                    flags, attachments_json, in_reply_to, references_json,
-                    headers_fetched_at, body_fetched_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    msg.message_id,
-                    msg.conv_id,
-                    msg.account,
-                    msg.folder,
-                    msg.from_.addr,
-                    msg.from_.name,
-                    json.dumps([a.model_dump() for a in msg.to]),
-                    json.dumps([a.model_dump() for a in msg.cc]),
-                    json.dumps([a.model_dump() for a in msg.reply_to]),
-                    msg.subject,
-                    msg.date.isoformat(),
-                    msg.body_text,
-                    msg.body_html,
-                    json.dumps([f.value for f in msg.flags]),
-                    json.dumps([a.model_dump() for a in msg.attachments]),
-                    msg.in_reply_to,
-                    json.dumps(msg.references),
-                    (msg.headers_fetched_at or datetime.now(UTC)).isoformat(),
-                    msg.body_fetched_at.isoformat() if msg.body_fetched_at else None,
-                ),
-            )
+        self.store_messages([msg])
+
+    def store_messages(self, messages: Sequence[Message]) -> None:
+        """Store or update many messages in a single transaction.
+
+        Bind parameters (JSON encoding included) are built before the
+        write lock is taken, so the transaction only spans the inserts.
+        """
+        if not messages:
+            return
+        rows = [self._message_params(m) for m in messages]
+        bodies = [p for p in map(self._body_params, messages) if p is not None]
+        with self._connect(write=True) as conn:
+            conn.executemany(self._STORE_SQL, rows)
+            if bodies:
+                conn.executemany(self._STORE_BODY_SQL, bodies)
+            if len(rows) >= ANALYZE_AFTER_ROWS:
+                conn.execute("ANALYZE messages")
 
     def get_message(self, message_id: str) -> Message | None:
         """Get a message by ID."""
         with self._connect() as conn:
             row = conn.execute(
-                "SELECT * FROM messages WHERE message_id = ?", (message_id,)
+                f"{_MESSAGE_SELECT} WHERE m.message_id = ?", (message_id,)
             ).fetchone()
             if row:
                 return self._row_to_message(row)
@@ -254,51 +632,18 @@ class Cache:
             malformed (not hex).
         """
         if not _CONV_ID_PREFIX_RE.match(prefix):
-            # Not a valid conv_id prefix — return empty rather than pass
-            # caller-controlled text into a LIKE pattern.
+            # Not a valid conv_id prefix, so no conversation can match
             return []
 
         with self._connect() as conn:
+            # Same index range as get_conversation(): lowercase hex IDs with
+            # this prefix sort in [prefix, prefix + "g")
             rows = conn.execute(
-                """
-                SELECT
-                    conv_id,
-                    MAX(date_utc) as latest_date,
-                    MIN(subject) as subject,
-                    COUNT(*) as message_count,
-                    SUM(CASE WHEN flags NOT LIKE '%"seen"%' THEN 1 ELSE 0 END) as unread_count,
-                    GROUP_CONCAT(DISTINCT from_addr) as participants,
-                    (SELECT body_text FROM messages m2
-                     WHERE m2.conv_id = messages.conv_id
-                     ORDER BY date_utc DESC LIMIT 1) as snippet,
-                    MIN(account) as account
-                FROM messages
-                WHERE conv_id LIKE ?
-                GROUP BY conv_id
-                ORDER BY latest_date DESC
-                """,
-                (prefix + "%",),
+                self._SUMMARY_SQL.format(where="conv_id >= ? AND conv_id < ?", limit=""),
+                (prefix, prefix + "g") * 2,
             ).fetchall()
 
-            summaries = []
-            for row in rows:
-                participants = row["participants"].split(",") if row["participants"] else []
-                snippet = (row["snippet"] or "")[:100]
-
-                summaries.append(
-                    ConversationSummary(
-                        conv_id=row["conv_id"],
-                        subject=row["subject"] or "(no subject)",
-                        participants=participants,
-                        message_count=row["message_count"],
-                        unread_count=row["unread_count"],
-                        latest_date=datetime.fromisoformat(row["latest_date"]),
-                        snippet=snippet,
-                        account=row["account"],
-                    )
-                )
-
-            return summaries
+            return [self._row_to_summary(row) for row in rows]
 
     def get_conversation(self, conv_id: str) -> Conversation | None:
         """Get a conversation by ID or unique prefix.
@@ -316,49 +661,68 @@ class Cache:
         with self._connect() as conn:
             # Try exact match first
             rows = conn.execute(
-                "SELECT * FROM messages WHERE conv_id = ? ORDER BY date_utc ASC",
+                f"{_CONVERSATION_SELECT} WHERE m.conv_id = ? ORDER BY m.date_utc ASC",
                 (conv_id,),
             ).fetchall()
 
             if rows:
                 return self._build_conversation(rows)
 
-            # Try prefix match - check if unique
-            matches = self.find_conversations_by_prefix(conv_id)
+            if not _CONV_ID_PREFIX_RE.match(conv_id):
+                return None
+
+            # Try prefix match - check if unique. Only two distinct IDs are
+            # needed to tell unique from ambiguous, so skip the aggregate
+            # summaries find_conversations_by_prefix() builds. IDs are
+            # lowercase hex, so [prefix, prefix + "g") is exactly the set of
+            # IDs with that prefix and can be answered from idx_messages_conv
+            # (a LIKE pattern cannot, being case-insensitive).
+            matches = conn.execute(
+                "SELECT DISTINCT conv_id FROM messages"
+                " WHERE conv_id >= ? AND conv_id < ? LIMIT 2",
+                (conv_id, conv_id + "g"),
+            ).fetchall()
             if len(matches) == 1:
                 # Unique match - fetch full conversation
                 rows = conn.execute(
-                    "SELECT * FROM messages WHERE conv_id = ? ORDER BY date_utc ASC",
-                    (matches[0].conv_id,),
+                    f"{_CONVERSATION_SELECT} WHERE m.conv_id = ? ORDER BY m.date_utc ASC",
+                    (matches[0]["conv_id"],),
                 ).fetchall()
                 return self._build_conversation(rows)
 
             # No match or ambiguous (multiple matches)
             return None
 
-    def _build_conversation(self, rows: list[sqlite3.Row]) -> Conversation:
-        """Build a Conversation object from message rows."""
-        messages = [self._row_to_message(row) for row in rows]
-        conv_id = messages[0].conv_id
-        participants = set()
-        unread_count = 0
+    def _build_conversation(self, rows: Iterable[sqlite3.Row]) -> Conversation:
+        """Build a Conversation object from message rows.
 
-        for msg in messages:
-            participants.add(msg.from_.addr)
-            for addr in msg.to + msg.cc:
-                participants.add(addr.addr)
-            if not msg.is_read:
-                unread_count += 1
+        One pass converts each row and accumulates the participants and
+        unread count alongside, so ``rows`` may be a live cursor.
+        """
+        messages: list[Message] = []
+        participants: set[str] = set()
+        unread_count = 0
 
+        for row in rows:
+            msg = self._row_to_message(row)
+            messages.append(msg)
+            # Scalar columns are read off the row; going through the model
+            # means attribute chains and, for is_read, a scan of msg.flags.
+            participants.add(row["from_addr"])
+            participants.update(addr.addr for addr in msg.to)
+            participants.update(addr.addr for addr in msg.cc)
+            unread_count += row["is_unread"]
+
+        first = messages[0]
         return Conversation(
-            conv_id=conv_id,
-            subject=messages[0].subject,
+            conv_id=first.conv_id,
+            subject=first.subject,
             participants=sorted(participants),
             message_count=len(messages),
             unread_count=unread_count,
             latest_date=max(m.date for m in messages),
             messages=messages,
-            account=messages[0].account,
+            account=first.account,
         )
 
     def list_conversations(
@@ -378,49 +742,22 @@ class Cache:
                 where_clauses.append("account = ?")
                 params.append(account)
 
-            # Get distinct conversations ordered by latest message
-            query = f"""
-                SELECT
-                    conv_id,
-                    MAX(date_utc) as latest_date,
-                    MIN(subject) as subject,
-                    COUNT(*) as message_count,
-                    SUM(CASE WHEN flags NOT LIKE '%"seen"%' THEN 1 ELSE 0 END) as unread_count,
-                    GROUP_CONCAT(DISTINCT from_addr) as participants,
-                    (SELECT body_text FROM messages m2
-                     WHERE m2.conv_id = messages.conv_id
-                     ORDER BY date_utc DESC LIMIT 1) as snippet,
-                    MIN(account) as account
-                FROM messages
-                WHERE {' AND '.join(where_clauses)}
-                GROUP BY conv_id
-                {"HAVING unread_count > 0" if unread_only else ""}
-                ORDER BY latest_date DESC
-                LIMIT ?
-            """
-            params.append(limit)
-
-            rows = conn.execute(query, params).fetchall()
-
-            summaries = []
-            for row in rows:
-                participants = row["participants"].split(",") if row["participants"] else []
-                snippet = (row["snippet"] or "")[:100]
-
-                summaries.append(
-                    ConversationSummary(
-                        conv_id=row["conv_id"],
-                        subject=row["subject"] or "(no subject)",
-                        participants=participants,
-                        message_count=row["message_count"],
-                        unread_count=row["unread_count"],
-                        latest_date=datetime.fromisoformat(row["latest_date"]),
-                        snippet=snippet,
-                        account=row["account"],
-                    )
+            if unread_only:
+                # Filter whole conversations (not just their unread rows) by
+                # probing the partial unread index instead of a HAVING pass
+                scope = " AND ".join(where_clauses)
+                where_clauses.append(
+                    f"conv_id IN (SELECT conv_id FROM messages WHERE is_unread = 1 AND {scope})"
                 )
+                params = params * 2
+
+            # Get distinct conversations ordered by latest message
+            query = self._SUMMARY_SQL.format(
+                where=" AND ".join(where_clauses), limit="LIMIT ?"
+            )
+            rows = conn.execute(query, [*params, limit, *params]).fetchall()
 
-            return summaries
+            return [self._row_to_summary(row) for row in rows]
 
     def execute_readonly_sql(
         self,
@@ -465,8 +802,9 @@ class Cache:
         wrapped = f"SELECT * FROM ({stripped}) LIMIT ?"
 
         db_uri = f"file:{self.db_path}?mode=ro"
-        conn = sqlite3.connect(db_uri, uri=True)
+        conn = sqlite3.connect(db_uri, uri=True, timeout=BUSY_TIMEOUT_S)
         conn.row_factory = sqlite3.Row
+        self._tune(conn)
         try:
             bind: tuple[Any, ...] = (
                 (*tuple(params), limit) if params else (limit,)
@@ -476,39 +814,120 @@ class Cache:
         finally:
             conn.close()
 
+    _UPDATE_FLAGS_SQL = "UPDATE messages SET flags = ?, is_unread = ? WHERE message_id = ?"
+
     def update_flags(self, message_id: str, flags: Sequence[MessageFlag]) -> None:
         """Update message flags."""
-        with self._connect() as conn:
-            conn.execute(
-                "UPDATE messages SET flags = ? WHERE message_id = ?",
-                (json.dumps([f.value for f in flags]), message_id),
+        self.update_flags_many({message_id: flags})
+
+    def update_flags_many(self, flags: Mapping[str, Sequence[MessageFlag]]) -> None:
+        """Replace the flags of many messages in one transaction."""
+        with self._connect(write=True) as conn:
+            conn.executemany(
+                self._UPDATE_FLAGS_SQL,
+                [
+                    (
+                        _dumps([f.value for f in message_flags]),
+                        int(MessageFlag.SEEN not in message_flags),
+                        message_id,
+                    )
+                    for message_id, message_flags in flags.items()
+                ],
             )
 
+    _FLAG_ON_SQL = """
+        UPDATE messages SET
+            flags = json_insert(flags, '$[#]', ?1),
+            is_unread = CASE WHEN ?1 = 'seen' THEN 0 ELSE is_unread END
+        WHERE message_id = ?2
+          AND NOT EXISTS (SELECT 1 FROM json_each(flags) WHERE value = ?1)
+    """
+    _FLAG_OFF_SQL = """
+        UPDATE messages SET
+            flags = (
+                SELECT json_group_array(value) FROM json_each(flags) WHERE value != ?1
+            ),
+            is_unread = CASE WHEN ?1 = 'seen' THEN 1 ELSE is_unread END
+        WHERE message_id = ?2
+    """
+
+    def set_flag(self, message_id: str, flag: MessageFlag, on: bool) -> None:
+        """Add or remove one flag in place, without reading the row back."""
+        self.set_flag_many([message_id], flag, on)
+
+    def set_flag_many(
+        self, message_ids: Sequence[str], flag: MessageFlag, on: bool
+    ) -> None:
+        """Add or remove one flag on many messages in a single transaction."""
+        with self._connect(write=True) as conn:
+            conn.executemany(
+                self._FLAG_ON_SQL if on else self._FLAG_OFF_SQL,
+                [(flag.value, message_id) for message_id in message_ids],
+            )
+
+    def get_folder(self, message_id: str) -> str | None:
+        """Get the cached folder of a message, or None if it isn't cached."""
+        return self.get_folders([message_id]).get(message_id)
+
+    def get_folders(self, message_ids: Sequence[str]) -> dict[str, str]:
+        """Map cached message IDs to their folders; uncached IDs are omitted."""
+        if not message_ids:
+            return {}
+        placeholders = ",".join("?" * len(message_ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT message_id, folder FROM messages WHERE message_id IN ({placeholders})",
+                list(message_ids),
+            ).fetchall()
+        return {row["message_id"]: row["folder"] for row in rows}
+
     def update_body(
         self, message_id: str, body_text: str | None, body_html: str | None
     ) -> None:
         """Update message body content."""
-        with self._connect() as conn:
-            conn.execute(
-                """
-                UPDATE messages
-                SET body_text = ?, body_html = ?, body_fetched_at = ?
-                WHERE message_id = ?
-                """,
-                (body_text, body_html, datetime.now(UTC).isoformat(), message_id),
+        self.update_bodies({message_id: (body_text, body_html)})
+
+    def update_bodies(
+        self, bodies: Mapping[str, tuple[str | None, str | None]]
+    ) -> None:
+        """Update body content for many messages in one transaction."""
+        fetched_at = datetime.now(UTC).isoformat()
+        with self._connect(write=True) as conn:
+            conn.executemany(
+                self._UPDATE_BODY_SQL,
+                [
+                    (body_text, body_html, fetched_at, message_id)
+                    for message_id, (body_text, body_html) in bodies.items()
+                ],
             )
 
     def move_message(self, message_id: str, folder: str) -> None:
         """Update message folder."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute(
                 "UPDATE messages SET folder = ? WHERE message_id = ?",
                 (folder, message_id),
             )
 
+    def move_messages(self, message_ids: Sequence[str], folder: str) -> None:
+        """Update the folder of many messages in a single transaction."""
+        with self._connect(write=True) as conn:
+            conn.executemany(
+                "UPDATE messages SET folder = ? WHERE message_id = ?",
+                [(folder, message_id) for message_id in message_ids],
+            )
+
+    def set_conv_id(self, message_ids: Sequence[str], conv_id: str) -> None:
+        """Regroup cached messages into a conversation, keeping folder and flags."""
+        with self._connect(write=True) as conn:
+            conn.executemany(
+                "UPDATE messages SET conv_id = ? WHERE message_id = ?",
+                [(conv_id, message_id) for message_id in message_ids],
+            )
+
     def delete_message(self, message_id: str) -> None:
         """Delete a message from cache."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute("DELETE FROM messages WHERE message_id = ?", (message_id,))
 
     def is_fresh(
@@ -525,15 +944,15 @@ class Cache:
         with self._connect() as conn:
             if check_body:
                 row = conn.execute(
-                    "SELECT body_fetched_at, body_text, body_html "
-                    "FROM messages WHERE message_id = ?",
+                    "SELECT fetched_at, body_text, body_html "
+                    "FROM message_bodies WHERE message_id = ?",
                     (message_id,),
                 ).fetchone()
-                if not row or not row["body_fetched_at"]:
+                if not row or not row["fetched_at"]:
                     return False
                 if row["body_text"] is None and row["body_html"] is None:
                     return False
-                fetched_at = datetime.fromisoformat(row["body_fetched_at"])
+                fetched_at = datetime.fromisoformat(row["fetched_at"])
             else:
                 row = conn.execute(
                     "SELECT headers_fetched_at FROM messages WHERE message_id = ?",
@@ -559,7 +978,7 @@ class Cache:
 
     def mark_inbox_synced(self, account: str) -> None:
         """Mark inbox as synced."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute(
                 "INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)",
                 (f"inbox_sync_{account}", datetime.now(UTC).isoformat()),
@@ -575,7 +994,7 @@ class Cache:
 
     def set_meta(self, key: str, value: str) -> None:
         """Set a value in cache_meta."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute(
                 "INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)",
                 (key, value),
@@ -583,48 +1002,59 @@ class Cache:
 
     def delete_meta(self, key: str) -> None:
         """Delete a value from cache_meta. No-op if absent."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute("DELETE FROM cache_meta WHERE key = ?", (key,))
 
     def prune_old_messages(self, window_days: int = 7) -> int:
         """Remove messages older than the cache window. Returns count deleted."""
         cutoff = datetime.now(UTC) - timedelta(days=window_days)
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             cursor = conn.execute(
                 "DELETE FROM messages WHERE date_utc < ?", (cutoff.isoformat(),)
             )
+            if cursor.rowcount:
+                # Each trigger-driven FTS delete leaves a small tombstone
+                # segment; merge them in one pass rather than letting later
+                # writes and queries work through them incrementally
+                conn.execute("INSERT INTO messages_fts(messages_fts, rank) VALUES('merge', -500)")
             return cursor.rowcount
 
     def clear(self) -> None:
         """Clear all cached data (except send log)."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
+            # Everything goes, so skip messages_ad's per-row FTS delete and
+            # body cleanup: drop it for this transaction, empty the tables
+            # (trigger-free DELETEs truncate), and reset the index in one step.
+            trigger_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'messages_ad'"
+            ).fetchone()["sql"]
+            conn.execute("DROP TRIGGER messages_ad")
             conn.execute("DELETE FROM messages")
+            conn.execute("DELETE FROM message_bodies")
+            conn.execute("INSERT INTO messages_fts(messages_fts) VALUES('delete-all')")
+            conn.execute(trigger_sql)
             conn.execute("DELETE FROM cache_meta")
             conn.execute("DELETE FROM drafts")
-            # Rebuild FTS index
-            conn.execute("INSERT INTO messages_fts(messages_fts) VALUES('rebuild')")
 
     def get_stats(self) -> CacheStats:
         """Get cache statistics."""
         with self._connect() as conn:
-            msg_count = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
-            conv_count = conn.execute(
-                "SELECT COUNT(DISTINCT conv_id) FROM messages"
-            ).fetchone()[0]
-
-            oldest = conn.execute(
-                "SELECT MIN(date_utc) FROM messages"
-            ).fetchone()[0]
-            newest = conn.execute(
-                "SELECT MAX(date_utc) FROM messages"
-            ).fetchone()[0]
+            # One scan computes all four aggregates
+            msg_count, conv_count, oldest, newest = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT conv_id), MIN(date_utc), MAX(date_utc)"
+                " FROM messages"
+            ).fetchone()
 
             last_sync = conn.execute(
                 "SELECT MAX(value) FROM cache_meta WHERE key LIKE 'inbox_sync_%'"
             ).fetchone()[0]
 
-            # Get file size
-            cache_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+            # Get file size; under WAL, recent writes live in the -wal file
+            cache_size = sum(
+                path.stat().st_size
+                for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal"))
+                if path.exists()
+            )
 
             return CacheStats(
                 message_count=msg_count,
@@ -646,15 +1076,34 @@ class Cache:
                 return dict(row)
         return None
 
-    def set_sync_state(self, account: str, folder: str, last_uid: int) -> None:
-        """Update the sync state for an account/folder pair."""
-        with self._connect() as conn:
+    def set_sync_state(
+        self,
+        account: str,
+        folder: str,
+        last_uid: int,
+        uidvalidity: int | None = None,
+        highest_modseq: int | None = None,
+    ) -> None:
+        """Update the sync state for an account/folder pair.
+
+        ``uidvalidity`` and ``highest_modseq`` are only known for CONDSTORE
+        servers; they let the next sync ask for flag changes alone.
+        """
+        with self._connect(write=True) as conn:
             conn.execute(
                 """
-                INSERT OR REPLACE INTO sync_state (account, folder, last_uid, last_sync_utc)
-                VALUES (?, ?, ?, ?)
+                INSERT OR REPLACE INTO sync_state
+                    (account, folder, last_uid, last_sync_utc, uidvalidity, highest_modseq)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (account, folder, last_uid, datetime.now(UTC).isoformat()),
+                (
+                    account,
+                    folder,
+                    last_uid,
+                    datetime.now(UTC).isoformat(),
+                    uidvalidity,
+                    highest_modseq,
+                ),
             )
 
     def log_send(
@@ -667,7 +1116,7 @@ class Cache:
         message_id: str | None,
     ) -> None:
         """Log a sent message to the audit log."""
-        with self._connect() as conn:
+        with self._connect(write=True) as conn:
             conn.execute(
                 """
                 INSERT INTO send_log (timestamp, account, to_json, cc_json, bcc_json, subject, message_id)
@@ -676,9 +1125,9 @@ class Cache:
                 (
                     datetime.now(UTC).isoformat(),
                     account,
-                    json.dumps([a.model_dump() for a in to]),
-                    json.dumps([a.model_dump() for a in cc]),
-                    json.dumps([a.model_dump() for a in bcc]),
+                    _ADDRESS_LIST.dump_json(to).decode(),
+                    _ADDRESS_LIST.dump_json(cc).decode(),
+                    _ADDRESS_LIST.dump_json(bcc).decode(),
                     subject,
                     message_id,
                 ),
@@ -706,5 +1155,6 @@ def get_cache() -> Cache:
     """Get or create the global cache instance."""
     global _cache
     if _cache is None:
-        _cache = Cache()
+        _cache = Cache(cache_size_mb=get_config().cache.cache_size_mb)
+        atexit.register(_cache.close)
     return _cache
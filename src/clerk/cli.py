@@ -1,13 +1,13 @@
 """Clerk CLI — setup, auth, and debug commands. Primary interface is MCP."""
 
-import json
-from typing import Annotated, Any
+import sys
+from typing import TYPE_CHECKING, Annotated, Any
 
+import orjson
 import typer
 from rich.console import Console
 
 from . import __version__
-from .api import get_api
 from .config import (
     AccountConfig,
     FromAddress,
@@ -22,9 +22,11 @@ from .config import (
     save_config,
     save_password,
 )
-from .imap_client import ImapClient
 from .models import ExitCode
 
+if TYPE_CHECKING:
+    from .api import ClerkAPI
+
 app = typer.Typer(
     name="clerk",
     help="Email MCP server for LLM agents. Use 'clerk mcp-server' to start.",
@@ -36,8 +38,22 @@ err_console = Console(stderr=True)
 
 
 def output_json(data: dict[str, Any] | list[Any]) -> None:
-    """Output data as JSON."""
-    print(json.dumps(data, default=str, indent=2))
+    """Output data as JSON.
+
+    orjson encodes straight to bytes, which go to the binary stream without
+    an intermediate str; datetimes come out as ISO 8601. Text-only streams
+    (no ``.buffer``, e.g. StringIO) get the decoded string instead.
+    """
+    payload = orjson.dumps(
+        data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(payload.decode() + "\n")
+        return
+    sys.stdout.flush()
+    buffer.write(payload + b"\n")
+    buffer.flush()
 
 
 def exit_with_code(code: ExitCode, message: str | None = None) -> None:
@@ -47,6 +63,18 @@ def exit_with_code(code: ExitCode, message: str | None = None) -> None:
     raise typer.Exit(code.value)
 
 
+def get_api() -> "ClerkAPI":
+    """Get the shared ClerkAPI.
+
+    The API layer pulls in the cache, IMAP and SMTP clients, so it is imported
+    here rather than at module level; ``clerk version``, ``--help`` and the
+    account setup commands start without it.
+    """
+    from .api import get_api as _get_api
+
+    return _get_api()
+
+
 # ============================================================================
 # Primary Entry Point
 # ============================================================================
@@ -161,44 +189,38 @@ accounts_app = typer.Typer(help="Account management commands")
 app.add_typer(accounts_app, name="accounts")
 
 
-def _guess_imap_host(email: str) -> str:
-    """Guess IMAP host from email domain."""
-    domain = email.split("@")[1].lower()
-    known_hosts = {
-        "gmail.com": "imap.gmail.com",
-        "googlemail.com": "imap.gmail.com",
-        "outlook.com": "outlook.office365.com",
-        "hotmail.com": "outlook.office365.com",
-        "live.com": "outlook.office365.com",
-        "yahoo.com": "imap.mail.yahoo.com",
-        "fastmail.com": "imap.fastmail.com",
-        "fastmail.fm": "imap.fastmail.com",
-        "icloud.com": "imap.mail.me.com",
-        "me.com": "imap.mail.me.com",
-        "protonmail.com": "127.0.0.1",
-        "proton.me": "127.0.0.1",
-    }
-    return known_hosts.get(domain, f"imap.{domain}")
-
-
-def _guess_smtp_host(email: str) -> str:
-    """Guess SMTP host from email domain."""
-    domain = email.split("@")[1].lower()
-    known_hosts = {
-        "gmail.com": "smtp.gmail.com",
-        "googlemail.com": "smtp.gmail.com",
-        "outlook.com": "smtp.office365.com",
-        "hotmail.com": "smtp.office365.com",
-        "live.com": "smtp.office365.com",
-        "yahoo.com": "smtp.mail.yahoo.com",
-        "fastmail.com": "smtp.fastmail.com",
-        "fastmail.fm": "smtp.fastmail.com",
-        "icloud.com": "smtp.mail.me.com",
-        "me.com": "smtp.mail.me.com",
-        "protonmail.com": "127.0.0.1",
-        "proton.me": "127.0.0.1",
-    }
-    return known_hosts.get(domain, f"smtp.{domain}")
+# (IMAP host, SMTP host) for well-known providers by email domain
+_PROVIDER_HOSTS: dict[str, tuple[str, str]] = {
+    "gmail.com": ("imap.gmail.com", "smtp.gmail.com"),
+    "googlemail.com": ("imap.gmail.com", "smtp.gmail.com"),
+    "outlook.com": ("outlook.office365.com", "smtp.office365.com"),
+    "hotmail.com": ("outlook.office365.com", "smtp.office365.com"),
+    "live.com": ("outlook.office365.com", "smtp.office365.com"),
+    "yahoo.com": ("imap.mail.yahoo.com", "smtp.mail.yahoo.com"),
+    "fastmail.com": ("imap.fastmail.com", "smtp.fastmail.com"),
+    "fastmail.fm": ("imap.fastmail.com", "smtp.fastmail.com"),
+    "icloud.com": ("imap.mail.me.com", "smtp.mail.me.com"),
+    "me.com": ("imap.mail.me.com", "smtp.mail.me.com"),
+    "protonmail.com": ("127.0.0.1", "127.0.0.1"),
+    "proton.me": ("127.0.0.1", "127.0.0.1"),
+}
+
+
+def _guess_hosts(email: str) -> tuple[str, str]:
+    """Guess (IMAP host, SMTP host) from the email domain.
+
+    The domain and each parent of it are tried in turn, so subdomains of a
+    known provider (user@team.fastmail.com) resolve to the provider's hosts.
+    Unknown domains get imap./smtp.<domain>.
+    """
+    domain = email.rpartition("@")[2].lower()
+    suffix = domain
+    while suffix:
+        hosts = _PROVIDER_HOSTS.get(suffix)
+        if hosts:
+            return hosts
+        suffix = suffix.partition(".")[2]
+    return f"imap.{domain}", f"smtp.{domain}"
 
 
 @accounts_app.callback(invoke_without_command=True)
@@ -230,11 +252,14 @@ def accounts_list(
         console.print("Run 'clerk accounts add' to configure an account.")
         return
 
+    # One print call renders and writes the whole listing at once
+    lines = []
     for name, acc in config.accounts.items():
         default = " [dim](default)[/dim]" if name == config.default_account else ""
-        console.print(f"[bold]{name}[/bold]{default}")
-        console.print(f"  Email: {acc.from_.address}")
-        console.print(f"  Protocol: {acc.protocol}")
+        lines.append(f"[bold]{name}[/bold]{default}")
+        lines.append(f"  Email: {acc.from_.address}")
+        lines.append(f"  Protocol: {acc.protocol}")
+    console.print("\n".join(lines))
 
 
 @accounts_app.command(name="add")
@@ -284,11 +309,12 @@ def accounts_add(
 
 def _setup_imap_account(name: str, email: str) -> AccountConfig:
     """Set up an IMAP account interactively."""
-    imap_host = typer.prompt("IMAP host", default=_guess_imap_host(email))
+    imap_default, smtp_default = _guess_hosts(email)
+    imap_host = typer.prompt("IMAP host", default=imap_default)
     imap_port = typer.prompt("IMAP port", default="993", show_default=True)
     imap_username = typer.prompt("IMAP username", default=email)
 
-    smtp_host = typer.prompt("SMTP host", default=_guess_smtp_host(email))
+    smtp_host = typer.prompt("SMTP host", default=smtp_default)
     smtp_port = typer.prompt("SMTP port", default="587", show_default=True)
     smtp_username = typer.prompt("SMTP username", default=email)
 
@@ -401,6 +427,8 @@ def accounts_test(
 
     console.print("[dim]Testing IMAP connection...[/dim]")
     try:
+        from .imap_client import ImapClient
+
         client = ImapClient(name, account_config)
         client.connect()
         folder_count = len(client.list_folders())
@@ -2,6 +2,8 @@
 
 import contextlib
 import os
+import re
+import shlex
 import subprocess
 from pathlib import Path
 from typing import Literal
@@ -10,6 +12,14 @@ import keyring
 import yaml
 from pydantic import BaseModel, EmailStr, Field, model_validator
 
+# libyaml's C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 
 def get_config_dir() -> Path:
     """Get the configuration directory."""
@@ -58,6 +68,19 @@ class OAuthConfig(BaseModel):
     client_id_file: Path
 
 
+# password_cmd output by (account, command). The command is run once per
+# process instead of once per IMAP/SMTP connect.
+_password_cmd_cache: dict[tuple[str, str], str] = {}
+
+# password_file contents by path, with the (st_mtime_ns, st_size) they were
+# read at. The file is still stat()ed on every call for the permission check.
+_password_file_cache: dict[Path, tuple[int, int, str]] = {}
+
+# Anything a plain argv cannot express (pipes, redirection, expansion, ...).
+# "=" catches VAR=value prefixes, which only a shell turns into environment.
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?~{}\[\]!#=\n]")
+
+
 class AccountConfig(BaseModel):
     """Configuration for a single email account."""
 
@@ -97,7 +120,7 @@ class AccountConfig(BaseModel):
         """
         # Try keyring first
         try:
-            password = keyring.get_password("clerk", account_name)
+            password = _keyring_get("clerk", account_name)
             if password:
                 return password
         except Exception:
@@ -105,35 +128,64 @@ class AccountConfig(BaseModel):
 
         # Try password command
         if self.password_cmd:
-            result = subprocess.run(
-                self.password_cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            key = (account_name, self.password_cmd)
+            if key in _password_cmd_cache:
+                return _password_cmd_cache[key]
+            # Plain commands run directly; only shell syntax needs a shell
+            use_shell = bool(_SHELL_SYNTAX_RE.search(self.password_cmd))
+            try:
+                result = subprocess.run(
+                    self.password_cmd if use_shell else shlex.split(self.password_cmd),
+                    shell=use_shell,
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+            except OSError as e:
+                raise ValueError(f"Password command failed: {e}") from e
             if result.returncode == 0:
-                return result.stdout.strip()
+                password = result.stdout.strip()
+                _password_cmd_cache[key] = password
+                return password
             raise ValueError(f"Password command failed: {result.stderr}")
 
         # Try password file
         if self.password_file:
             path = Path(self.password_file).expanduser()
-            if not path.exists():
-                raise ValueError(f"Password file not found: {path}")
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                raise ValueError(f"Password file not found: {path}") from None
             # Check permissions (should be 600)
-            mode = path.stat().st_mode & 0o777
+            mode = st.st_mode & 0o777
             if mode != 0o600:
                 raise ValueError(
                     f"Password file {path} has insecure permissions {oct(mode)}, should be 0600"
                 )
-            return path.read_text().strip()
+            cached = _password_file_cache.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                return cached[2]
+            password = path.read_text().strip()
+            _password_file_cache[path] = (st.st_mtime_ns, st.st_size, password)
+            return password
 
         raise ValueError(
             f"No password configured for account '{account_name}'. "
             "Set via keyring, password_cmd, or password_file."
         )
 
+    def forget_password(self, account_name: str) -> None:
+        """Drop any remembered password so the next lookup goes to the source.
+
+        Called when the server rejects a login, so a rotated password is
+        picked up without restarting a long-lived process.
+        """
+        _keyring_cache.pop(("clerk", account_name), None)
+        if self.password_cmd:
+            _password_cmd_cache.pop((account_name, self.password_cmd), None)
+        if self.password_file:
+            _password_file_cache.pop(Path(self.password_file).expanduser(), None)
+
 
 class CacheConfig(BaseModel):
     """Cache configuration."""
@@ -141,6 +193,7 @@ class CacheConfig(BaseModel):
     window_days: int = Field(default=7, ge=1, le=365)
     inbox_freshness_min: int = Field(default=5, ge=1)
     body_freshness_min: int = Field(default=60, ge=1)
+    cache_size_mb: int = Field(default=64, ge=1)
 
 
 class SendConfig(BaseModel):
@@ -180,7 +233,12 @@ class ClerkConfig(BaseModel):
         return self
 
     def get_account(self, name: str | None = None) -> tuple[str, AccountConfig]:
-        """Get an account configuration by name or default."""
+        """Get an account configuration by name or default.
+
+        Deliberately not memoized: this is already a couple of dict lookups
+        on the loaded model, and the CLI edits ``accounts`` and
+        ``default_account`` in place, which a cache would not see.
+        """
         if name is None:
             name = self.default_account
         if not name:
@@ -192,23 +250,40 @@ class ClerkConfig(BaseModel):
 
 _config: ClerkConfig | None = None
 
+# Parsed configs by path, with the (st_mtime_ns, st_size) they were read at
+_config_cache: dict[Path, tuple[int, int, ClerkConfig]] = {}
+
 
 def load_config(config_path: Path | None = None) -> ClerkConfig:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file.
+
+    A file whose mtime and size are unchanged since the last load is not
+    re-read or re-validated. save_config() drops the cached entry, so its
+    writes are always seen; an outside edit is picked up once it changes
+    the file's mtime or size.
+    Callers get their own deep copy, so mutating one (as the account
+    commands do before saving) never leaks into later loads.
+    """
     global _config
 
     if config_path is None:
         config_path = get_config_dir() / "config.yaml"
 
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         # Return empty config - user needs to set up accounts
         _config = ClerkConfig()
         return _config
 
-    with open(config_path) as f:
-        data = yaml.safe_load(f) or {}
+    cached = _config_cache.get(config_path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        with open(config_path) as f:
+            data = yaml.load(f, Loader=_YamlLoader) or {}
+        cached = (st.st_mtime_ns, st.st_size, ClerkConfig.model_validate(data))
+        _config_cache[config_path] = cached
 
-    _config = ClerkConfig.model_validate(data)
+    _config = cached[2].model_copy(deep=True)
     return _config
 
 
@@ -220,21 +295,49 @@ def get_config() -> ClerkConfig:
     return _config
 
 
+# Keyring entries already read or written by this process, by (service,
+# username). Each keyring read is an IPC round trip (and can prompt on macOS),
+# and every IMAP/SMTP connect asks for the password. Misses are not kept, so
+# a secret another process stores later is still found.
+_keyring_cache: dict[tuple[str, str], str] = {}
+
+
+def _keyring_get(service: str, username: str) -> str | None:
+    """Read a keyring entry, reusing the value from an earlier read."""
+    key = (service, username)
+    value = _keyring_cache.get(key)
+    if value is None:
+        value = keyring.get_password(service, username)
+        if value is not None:
+            _keyring_cache[key] = value
+    return value
+
+
+def _keyring_set(service: str, username: str, value: str) -> None:
+    keyring.set_password(service, username, value)
+    _keyring_cache[(service, username)] = value
+
+
+def _keyring_delete(service: str, username: str) -> None:
+    _keyring_cache.pop((service, username), None)
+    with contextlib.suppress(keyring.errors.PasswordDeleteError):
+        keyring.delete_password(service, username)
+
+
 def save_password(account_name: str, password: str) -> None:
     """Save password to system keyring."""
-    keyring.set_password("clerk", account_name, password)
+    _keyring_set("clerk", account_name, password)
 
 
 def delete_password(account_name: str) -> None:
     """Delete password from system keyring."""
-    with contextlib.suppress(keyring.errors.PasswordDeleteError):
-        keyring.delete_password("clerk", account_name)
+    _keyring_delete("clerk", account_name)
 
 
 def get_oauth_token(account_name: str) -> str | None:
     """Retrieve OAuth token from keyring."""
     try:
-        return keyring.get_password("clerk-oauth", account_name)
+        return _keyring_get("clerk-oauth", account_name)
     except Exception:
         return None
 
@@ -246,13 +349,12 @@ def save_oauth_token(account_name: str, token_json: str) -> None:
         account_name: The account identifier
         token_json: JSON-serialized credentials (from google.oauth2.credentials)
     """
-    keyring.set_password("clerk-oauth", account_name, token_json)
+    _keyring_set("clerk-oauth", account_name, token_json)
 
 
 def delete_oauth_token(account_name: str) -> None:
     """Delete OAuth token from keyring."""
-    with contextlib.suppress(keyring.errors.PasswordDeleteError):
-        keyring.delete_password("clerk-oauth", account_name)
+    _keyring_delete("clerk-oauth", account_name)
 
 
 def get_m365_token_cache(account_name: str) -> str | None:
@@ -287,16 +389,34 @@ def save_config(config: ClerkConfig, config_path: Path | None = None) -> None:
     # Ensure parent directory exists
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Convert to dict, handling the 'from' field alias
-    data = config.model_dump(by_alias=True, exclude_none=True)
+    # Convert to dict, handling the 'from' field alias. JSON mode turns Path
+    # fields into strings, which the safe dumper can represent.
+    data = config.model_dump(mode="json", by_alias=True, exclude_none=True)
 
     with open(config_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
+
+    # A same-size rewrite within the filesystem's mtime granularity would
+    # otherwise look unchanged to load_config()
+    _config_cache.pop(config_path, None)
+
+
+# Directory pairs ensure_dirs() has already created in this process
+_ensured_dirs: set[tuple[Path, Path]] = set()
 
 
 def ensure_dirs() -> None:
-    """Ensure configuration and data directories exist."""
-    get_config_dir().mkdir(parents=True, exist_ok=True)
-    get_data_dir().mkdir(parents=True, exist_ok=True)
+    """Ensure configuration and data directories exist.
+
+    Every MCP tool call starts here, so the mkdir calls only run the first
+    time a given (config, data) directory pair is seen.
+    """
+    dirs = (get_config_dir(), get_data_dir())
+    if dirs in _ensured_dirs:
+        return
+    config_dir, data_dir = dirs
+    config_dir.mkdir(parents=True, exist_ok=True)
+    data_dir.mkdir(parents=True, exist_ok=True)
     # Ensure oauth tokens directory exists
-    (get_data_dir() / "oauth_tokens").mkdir(exist_ok=True)
+    (data_dir / "oauth_tokens").mkdir(exist_ok=True)
+    _ensured_dirs.add(dirs)
@@ -1,17 +1,22 @@
 """IMAP client for fetching email."""
 
+import atexit
 import contextlib
 import email
 import email.header
 import email.utils
 import hashlib
 import re
-from collections.abc import Sequence
+import sys
+import threading
+import time
+from collections.abc import Collection, Iterable, Iterator, Sequence
 from datetime import UTC, datetime
 from email.message import Message as EmailMessage
 from typing import Any, ClassVar
 
 from imapclient import IMAPClient  # type: ignore[import-untyped]
+from imapclient.exceptions import LoginError  # type: ignore[import-untyped]
 
 from .config import AccountConfig, get_config
 from .models import Address, Attachment, FolderInfo, Message, MessageFlag, UnreadCounts
@@ -51,16 +56,18 @@ def parse_address(addr_tuple: tuple[str, str] | None) -> Address | None:
 
 
 def parse_address_list(header: str | None) -> list[Address]:
-    """Parse a comma-separated address header."""
+    """Parse a comma-separated address header.
+
+    getaddresses() tokenizes the whole header at once, so a comma inside a
+    quoted display name ("Doe, John" <j@x>) does not split the address.
+    """
     if not header:
         return []
     addresses = []
-    for addr_str in header.split(","):
-        addr_str = addr_str.strip()
-        if addr_str:
-            parsed = parse_address(email.utils.parseaddr(addr_str))
-            if parsed:
-                addresses.append(parsed)
+    for addr_tuple in email.utils.getaddresses([header]):
+        parsed = parse_address(addr_tuple)
+        if parsed:
+            addresses.append(parsed)
     return addresses
 
 
@@ -188,6 +195,35 @@ def compute_conv_id(message_id: str, references: list[str], in_reply_to: str | N
     return hashlib.sha256(root.encode()).hexdigest()[:12]
 
 
+def _thread_uids(node: Any) -> Iterator[int]:
+    """Flatten one THREAD response tree (nested tuples of UIDs)."""
+    if isinstance(node, int):
+        yield node
+    else:
+        for child in node:
+            yield from _thread_uids(child)
+
+
+def _uid_set(uids: Iterable[int]) -> str:
+    """Compress UIDs into an IMAP sequence set, e.g. ``1:3,7,9:10``.
+
+    IMAPClient joins a list with commas only; runs of consecutive UIDs
+    (the norm for a mailbox's newest messages) shrink to one range, keeping
+    the FETCH/STORE/COPY command line short however many messages it covers.
+    """
+    runs: list[list[int]] = []
+    for uid in sorted(set(uids)):
+        if runs and uid == runs[-1][1] + 1:
+            runs[-1][1] = uid
+        else:
+            runs.append([uid, uid])
+    return ",".join(str(lo) if lo == hi else f"{lo}:{hi}" for lo, hi in runs)
+
+
+# Message-IDs per SEARCH/FETCH in fetch_message_bodies; keeps command lines sane
+BODY_FETCH_BATCH_SIZE = 100
+
+
 class ImapClient:
     """IMAP client for a single account."""
 
@@ -195,6 +231,9 @@ class ImapClient:
         self.account_name = account_name
         self.config = account_config
         self._client: IMAPClient | None = None
+        self._capabilities: frozenset[str] | None = None
+        self._pool: ImapConnectionPool | None = None
+        self._last_used = 0.0
 
     # Hostnames for OAuth-authenticated IMAP providers.
     _XOAUTH2_HOSTS: ClassVar[dict[str, str]] = {
@@ -221,7 +260,11 @@ class ImapClient:
         self._client = IMAPClient(imap.host, port=imap.port, ssl=imap.ssl)
 
         password = self.config.get_password(self.account_name)
-        self._client.login(imap.username, password)
+        try:
+            self._client.login(imap.username, password)
+        except LoginError:
+            self.config.forget_password(self.account_name)
+            raise
 
     def _get_xoauth2_token(self) -> str:
         """Fetch an access token for the configured OAuth protocol."""
@@ -258,13 +301,19 @@ class ImapClient:
             with contextlib.suppress(Exception):
                 self._client.logout()
             self._client = None
+            self._capabilities = None
 
     def __enter__(self) -> "ImapClient":
         self.connect()
         return self
 
-    def __exit__(self, *args: Any) -> None:
-        self.disconnect()
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        # A pooled session goes back for reuse unless the block failed, in
+        # which case the connection state is unknown and it is dropped.
+        if self._pool is not None and exc_type is None and self._client is not None:
+            self._pool.release(self)
+        else:
+            self.disconnect()
 
     @property
     def client(self) -> IMAPClient:
@@ -273,6 +322,15 @@ class ImapClient:
             raise RuntimeError("Not connected to IMAP server")
         return self._client
 
+    def has_capability(self, name: str) -> bool:
+        """Whether the server advertises a capability (looked up once per session)."""
+        if self._capabilities is None:
+            self._capabilities = frozenset(
+                c.decode().upper() if isinstance(c, bytes) else c.upper()
+                for c in self.client.capabilities()
+            )
+        return name.upper() in self._capabilities
+
     def list_folders(self) -> list[FolderInfo]:
         """List all folders/labels."""
         folders = []
@@ -356,7 +414,7 @@ class ImapClient:
             fetch_items.append("BODY.PEEK[HEADER]")
 
         # Fetch message data
-        fetch_data = self.client.fetch(message_ids, fetch_items)
+        fetch_data = self.client.fetch(_uid_set(message_ids), fetch_items)
 
         messages = []
         now = datetime.now(UTC)
@@ -493,20 +551,7 @@ class ImapClient:
             Tuple of (messages, highest_uid_seen). highest_uid_seen will be
             at least since_uid even if no new messages are found.
         """
-        self.client.select_folder(folder, readonly=True)
-
-        if since_uid > 0:
-            # Fetch UIDs greater than the last known UID
-            message_uids = self.client.search(["UID", f"{since_uid + 1}:*"])
-            # Filter out the since_uid itself (IMAP UID ranges are inclusive)
-            message_uids = [uid for uid in message_uids if uid > since_uid]
-        else:
-            # First sync -- get recent messages
-            message_uids = self.client.search(["ALL"])
-            message_uids = sorted(message_uids, reverse=True)[:200]
-
-        if not message_uids:
-            return [], since_uid
+        selected = self.client.select_folder(folder, readonly=True)
 
         # Determine what to fetch -- same items as fetch_messages
         fetch_items = ["FLAGS", "ENVELOPE", "INTERNALDATE", "RFC822.SIZE"]
@@ -515,7 +560,26 @@ class ImapClient:
         else:
             fetch_items.append("BODY.PEEK[HEADER]")
 
-        fetch_data = self.client.fetch(message_uids, fetch_items)
+        if since_uid > 0:
+            # SELECT already reported the next UID to be assigned
+            uidnext = selected.get(b"UIDNEXT")
+            if not selected.get(b"EXISTS") or (uidnext is not None and uidnext <= since_uid + 1):
+                return [], since_uid
+            # FETCH the open-ended UID range directly rather than SEARCHing
+            # for it first. "n:*" always includes the highest UID even when
+            # it is below n, so drop anything already seen.
+            fetch_data = self.client.fetch(f"{since_uid + 1}:*", fetch_items)
+            fetch_data = {uid: data for uid, data in fetch_data.items() if uid > since_uid}
+        else:
+            # First sync -- get recent messages
+            message_uids = self.client.search(["ALL"])
+            message_uids = sorted(message_uids, reverse=True)[:200]
+            if not message_uids:
+                return [], since_uid
+            fetch_data = self.client.fetch(_uid_set(message_uids), fetch_items)
+
+        if not fetch_data:
+            return [], since_uid
 
         messages = []
         highest_uid = since_uid
@@ -529,11 +593,40 @@ class ImapClient:
                 if msg:
                     messages.append(msg)
             except Exception as e:
-                import sys
                 print(f"Warning: Failed to parse message {uid}: {e}", file=sys.stderr)
 
         return messages, highest_uid
 
+    def get_folder_state(self, folder: str) -> tuple[int, int]:
+        """Return a folder's (UIDVALIDITY, HIGHESTMODSEQ) via STATUS.
+
+        HIGHESTMODSEQ is only reported by servers with CONDSTORE.
+        """
+        status = self.client.folder_status(folder, [b"UIDVALIDITY", b"HIGHESTMODSEQ"])
+        return int(status[b"UIDVALIDITY"]), int(status[b"HIGHESTMODSEQ"])
+
+    def fetch_flag_changes(
+        self, folder: str, max_uid: int, since_modseq: int
+    ) -> dict[str, list[MessageFlag]]:
+        """Flags of messages up to max_uid whose MODSEQ moved past since_modseq.
+
+        One CONDSTORE ``FETCH ... (CHANGEDSINCE n)``, so only the delta
+        crosses the wire instead of every message's flags.
+        """
+        self.client.select_folder(folder, readonly=True)
+        fetch_data = self.client.fetch(
+            f"1:{max_uid}", ["FLAGS", "ENVELOPE"], modifiers=[f"CHANGEDSINCE {since_modseq}"]
+        )
+
+        changes: dict[str, list[MessageFlag]] = {}
+        for uid, data in fetch_data.items():
+            envelope = data.get(b"ENVELOPE")
+            message_id = envelope.message_id if envelope else None
+            if isinstance(message_id, bytes):
+                message_id = message_id.decode()
+            changes[message_id or f"<{uid}@local>"] = imap_flags_to_model(data.get(b"FLAGS", ()))
+        return changes
+
     def fetch_message_body(self, folder: str, message_id: str) -> tuple[str | None, str | None]:
         """Fetch just the body of a specific message."""
         self.client.select_folder(folder, readonly=True)
@@ -564,6 +657,134 @@ class ImapClient:
         email_msg = email.message_from_bytes(raw)
         return extract_body(email_msg)
 
+    def _search_message_ids(self, message_ids: Collection[str]) -> list[int]:
+        """UIDs in the selected folder matching any of the Message-IDs (one SEARCH)."""
+        if not message_ids:
+            return []
+        criteria: list[Any] = ["OR"] * (len(message_ids) - 1)
+        for message_id in message_ids:
+            criteria += ["HEADER", "Message-ID", message_id]
+        return list(self.client.search(criteria))
+
+    def fetch_message_bodies(
+        self,
+        folder: str,
+        message_ids: Sequence[str],
+        batch_size: int = BODY_FETCH_BATCH_SIZE,
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Fetch bodies for many messages in one folder.
+
+        Issues one SEARCH and one FETCH per batch of ``batch_size`` IDs
+        instead of a round-trip pair per message. Messages that can't be
+        found are left out of the result.
+        """
+        self.client.select_folder(folder, readonly=True)
+
+        bodies: dict[str, tuple[str | None, str | None]] = {}
+        for start in range(0, len(message_ids), batch_size):
+            batch = message_ids[start : start + batch_size]
+
+            # Synthetic IDs (<uid@local>) already name their UID
+            uid_to_id: dict[int, str] = {}
+            header_ids = set()
+            for message_id in batch:
+                synthetic_match = re.match(r"<(\d+)@local>", message_id)
+                if synthetic_match:
+                    uid_to_id[int(synthetic_match.group(1))] = message_id
+                else:
+                    header_ids.add(message_id)
+
+            uids = list(uid_to_id)
+            uids += [uid for uid in self._search_message_ids(header_ids) if uid not in uid_to_id]
+            if not uids:
+                continue
+
+            fetch_data = self.client.fetch(_uid_set(uids), ["ENVELOPE", "BODY.PEEK[]"])
+            for uid, data in fetch_data.items():
+                found_id: str | None = uid_to_id.get(uid)
+                if found_id is None:
+                    # HEADER search is a substring match; keep exact hits only
+                    envelope = data.get(b"ENVELOPE")
+                    env_id = envelope.message_id if envelope else None
+                    if isinstance(env_id, bytes):
+                        env_id = env_id.decode()
+                    if env_id not in header_ids or env_id in bodies:
+                        continue
+                    found_id = env_id
+
+                raw = data.get(b"BODY[]")
+                if raw:
+                    bodies[found_id] = extract_body(email.message_from_bytes(raw))
+
+        return bodies
+
+    def _fetch_full_messages(self, folder: str, uids: Sequence[int]) -> list[Message]:
+        """Fetch and parse complete messages (headers and bodies) in one FETCH."""
+        if not uids:
+            return []
+        fetch_data = self.client.fetch(
+            _uid_set(uids), ["FLAGS", "ENVELOPE", "INTERNALDATE", "RFC822.SIZE", "BODY.PEEK[]"]
+        )
+
+        messages = []
+        now = datetime.now(UTC)
+        for uid in sorted(fetch_data.keys()):
+            try:
+                msg = self._parse_message(uid, fetch_data[uid], folder, True, now)
+                if msg:
+                    messages.append(msg)
+            except Exception as e:
+                print(f"Warning: Failed to parse message {uid}: {e}", file=sys.stderr)
+        return messages
+
+    def fetch_gmail_thread(self, message_id: str) -> list[Message]:
+        """Fetch every message in the Gmail thread containing ``message_id``.
+
+        Requires X-GM-EXT-1. Looks the message up in All Mail, reads its
+        X-GM-THRID, then pulls the whole thread with one SEARCH and one
+        FETCH instead of chasing References headers folder by folder.
+        """
+        folder = self.client.find_special_folder(b"\\All") or "[Gmail]/All Mail"
+        self.client.select_folder(folder, readonly=True)
+
+        anchor = self.client.search(["HEADER", "Message-ID", message_id])
+        if not anchor:
+            return []
+        fetch_data = self.client.fetch(anchor[:1], ["X-GM-THRID"])
+        thrid = fetch_data.get(anchor[0], {}).get(b"X-GM-THRID")
+        if thrid is None:
+            return []
+
+        return self._fetch_full_messages(folder, self.client.search(["X-GM-THRID", thrid]))
+
+    def fetch_referenced_thread(
+        self, folder: str, message_ids: Sequence[str]
+    ) -> list[Message]:
+        """Fetch messages in ``folder`` that share a server-side thread with ``message_ids``.
+
+        Uses RFC 5256 THREAD (REFERENCES, or REFS where that is all the server
+        offers): one THREAD call returns every thread tree in the folder, so
+        the members are found without per-message header searches. The
+        anchors themselves are not returned.
+        """
+        algorithm = "REFERENCES" if self.has_capability("THREAD=REFERENCES") else "REFS"
+        self.client.select_folder(folder, readonly=True)
+
+        anchors: set[int] = set()
+        for start in range(0, len(message_ids), BODY_FETCH_BATCH_SIZE):
+            batch = message_ids[start : start + BODY_FETCH_BATCH_SIZE]
+            anchors.update(self._search_message_ids(batch))
+        if not anchors:
+            return []
+
+        members: set[int] = set()
+        for tree in self.client.thread(algorithm=algorithm, criteria="ALL", charset="UTF-8"):
+            uids = set(_thread_uids(tree))
+            if uids & anchors:
+                members |= uids
+
+        return self._fetch_full_messages(folder, sorted(members - anchors))
+
     def fetch_attachment(self, folder: str, message_id: str, filename: str) -> bytes:
         """Fetch a specific attachment from a message.
 
@@ -657,6 +878,39 @@ class ImapClient:
         imap_flags = model_flags_to_imap(flags)
         self.client.remove_flags([uid], imap_flags)
 
+    def _resolve_uids(self, message_ids: Sequence[str]) -> list[int]:
+        """UIDs in the selected folder for ``message_ids`` (one SEARCH per batch)."""
+        uids: set[int] = set()
+        header_ids = []
+        for message_id in message_ids:
+            synthetic_match = re.match(r"<(\d+)@local>", message_id)
+            if synthetic_match:
+                uids.add(int(synthetic_match.group(1)))
+            else:
+                header_ids.append(message_id)
+        for start in range(0, len(header_ids), BODY_FETCH_BATCH_SIZE):
+            batch = header_ids[start : start + BODY_FETCH_BATCH_SIZE]
+            uids.update(self._search_message_ids(batch))
+        if not uids:
+            raise ValueError(f"Messages not found: {', '.join(message_ids)}")
+        return sorted(uids)
+
+    def add_flags_many(
+        self, folder: str, message_ids: Sequence[str], flags: Sequence[MessageFlag]
+    ) -> None:
+        """Add flags to many messages with a single STORE."""
+        self.client.select_folder(folder)
+        uid_set = _uid_set(self._resolve_uids(message_ids))
+        self.client.add_flags(uid_set, model_flags_to_imap(flags))
+
+    def remove_flags_many(
+        self, folder: str, message_ids: Sequence[str], flags: Sequence[MessageFlag]
+    ) -> None:
+        """Remove flags from many messages with a single STORE."""
+        self.client.select_folder(folder)
+        uid_set = _uid_set(self._resolve_uids(message_ids))
+        self.client.remove_flags(uid_set, model_flags_to_imap(flags))
+
     def move_message(self, message_id: str, from_folder: str, to_folder: str) -> None:
         """Move a message to another folder."""
         self.client.select_folder(from_folder)
@@ -674,6 +928,17 @@ class ImapClient:
         self.client.add_flags([uid], ["\\Deleted"])
         self.client.expunge()
 
+    def move_messages(
+        self, message_ids: Sequence[str], from_folder: str, to_folder: str
+    ) -> None:
+        """Move many messages with one COPY, one STORE and one EXPUNGE."""
+        self.client.select_folder(from_folder)
+        uid_set = _uid_set(self._resolve_uids(message_ids))
+
+        self.client.copy(uid_set, to_folder)
+        self.client.add_flags(uid_set, ["\\Deleted"])
+        self.client.expunge()
+
     def archive_message(self, message_id: str, from_folder: str = "INBOX") -> None:
         """Archive a message (move to Archive folder or All Mail for Gmail)."""
         # Try common archive folder names
@@ -692,8 +957,76 @@ class ImapClient:
         self.move_message(message_id, from_folder, archive_folder)
 
 
+class ImapConnectionPool:
+    """Idle authenticated IMAP sessions, kept per account for reuse.
+
+    Checkout hands back a parked session when one is available, so
+    back-to-back operations skip the connect + TLS + LOGIN round trips.
+    Sessions idle past ``max_idle`` are closed; shorter idles are checked
+    with a NOOP before reuse, since servers may drop quiet connections.
+    """
+
+    def __init__(self, max_idle: float = 600.0, noop_after: float = 60.0) -> None:
+        self.max_idle = max_idle
+        self.noop_after = noop_after
+        self._idle: dict[str, list[ImapClient]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, account_name: str, account_config: AccountConfig) -> ImapClient:
+        """Take an idle session for the account, or a fresh unconnected client."""
+        while True:
+            with self._lock:
+                parked = self._idle.get(account_name)
+                client = parked.pop() if parked else None
+            if client is None:
+                client = ImapClient(account_name, account_config)
+                client._pool = self
+                return client
+            if client.config != account_config:
+                client.disconnect()
+                continue
+            idle_for = time.monotonic() - client._last_used
+            if idle_for > self.max_idle:
+                client.disconnect()
+                continue
+            if idle_for > self.noop_after:
+                try:
+                    client.client.noop()
+                except Exception:
+                    client.disconnect()
+                    continue
+            return client
+
+    def release(self, client: ImapClient) -> None:
+        """Park a connected session for the next checkout."""
+        client._last_used = time.monotonic()
+        with self._lock:
+            self._idle.setdefault(client.account_name, []).append(client)
+
+    def close_all(self) -> None:
+        """Log out every idle session."""
+        with self._lock:
+            parked = [c for clients in self._idle.values() for c in clients]
+            self._idle.clear()
+        for client in parked:
+            client.disconnect()
+
+
+_pool = ImapConnectionPool()
+atexit.register(_pool.close_all)
+
+
 def get_imap_client(account_name: str | None = None) -> ImapClient:
-    """Get an IMAP client for the specified or default account."""
+    """Get an IMAP client for the specified or default account.
+
+    The client is checked out of a shared pool: leaving its ``with`` block
+    parks the session instead of logging out.
+    """
     config = get_config()
     name, account_config = config.get_account(account_name)
-    return ImapClient(name, account_config)
+    return _pool.acquire(name, account_config)
+
+
+def close_imap_connections() -> None:
+    """Log out all pooled IMAP sessions."""
+    _pool.close_all()
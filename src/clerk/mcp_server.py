@@ -109,6 +109,7 @@ def clerk_sync(
     account: str | None = None,
     folder: str = "INBOX",
     full: bool = False,
+    prefetch_bodies: int = 0,
 ) -> dict[str, Any]:
     """Sync email cache from IMAP server.
 
@@ -119,6 +120,8 @@ def clerk_sync(
         account: Account name (syncs all accounts if not specified)
         folder: Folder to sync (default: INBOX)
         full: Re-fetch all messages instead of incremental sync
+        prefetch_bodies: Fetch bodies of this many newest synced messages
+            in the background so the next clerk_read is served from cache
 
     Returns:
         Per-account sync results with counts
@@ -128,11 +131,13 @@ def clerk_sync(
 
     if account is not None:
         try:
-            return api.sync_folder(account=account, folder=folder, full=full)
+            return api.sync_folder(
+                account=account, folder=folder, full=full, prefetch_bodies=prefetch_bodies
+            )
         except Exception as e:
             return {"error": str(e)}
 
-    return api.sync_all(folder=folder, full=full)
+    return api.sync_all(folder=folder, full=full, prefetch_bodies=prefetch_bodies)
 
 
 @mcp.tool()
@@ -291,17 +296,21 @@ async def clerk_send(
 
 @mcp.tool()
 def clerk_move(
-    message_id: str,
+    message_id: str | list[str],
     to_folder: str,
     from_folder: str = "INBOX",
     account: str | None = None,
 ) -> dict[str, Any]:
-    """Move an email message to another folder.
+    """Move one or more email messages to another folder.
 
-    Use clerk://folders resource to see available folders.
+    Use clerk://folders resource to see available folders. Pass a list of
+    message IDs to move them in one batch: a single COPY, STORE \\Deleted and
+    EXPUNGE round for the source folder instead of one per message. This is
+    not an atomic MOVE; if a step fails, copies may already exist in the
+    destination.
 
     Args:
-        message_id: Message ID to move
+        message_id: Message ID to move, or a list of message IDs
         to_folder: Destination folder (e.g., "Archive", "Trash")
         from_folder: Source folder (default: INBOX)
         account: Account name (uses default if not specified)
@@ -312,7 +321,10 @@ def clerk_move(
     ensure_dirs()
     api = get_api()
     try:
-        api.move_message(message_id, to_folder, from_folder=from_folder, account=account)
+        if isinstance(message_id, list):
+            api.move_messages(message_id, to_folder, from_folder=from_folder, account=account)
+        else:
+            api.move_message(message_id, to_folder, from_folder=from_folder, account=account)
         return {"status": "success", "message_id": message_id, "folder": to_folder}
     except Exception as e:
         return {"error": str(e)}
@@ -329,14 +341,17 @@ _FLAG_ACTIONS: dict[str, tuple[MessageFlag, bool]] = {
 
 @mcp.tool()
 def clerk_flag(
-    message_id: str,
+    message_id: str | list[str],
     action: Literal["flag", "unflag", "read", "unread"],
     account: str | None = None,
 ) -> dict[str, Any]:
-    """Flag/unflag or mark read/unread on an email message.
+    """Flag/unflag or mark read/unread on one or more email messages.
+
+    Pass a list of message IDs to update them all with one IMAP STORE per
+    folder.
 
     Args:
-        message_id: Message ID
+        message_id: Message ID, or a list of message IDs
         action: One of "flag", "unflag", "read", "unread"
         account: Account name (uses default if not specified)
 
@@ -352,7 +367,10 @@ def clerk_flag(
 
     flag, on = mapping
     try:
-        api.set_flag(message_id, flag, on, account=account)
+        if isinstance(message_id, list):
+            api.set_flag_many(message_id, flag, on, account=account)
+        else:
+            api.set_flag(message_id, flag, on, account=account)
         return {"status": "success", "message_id": message_id, "action": action}
     except Exception as e:
         return {"error": str(e)}
@@ -613,27 +631,34 @@ SELECT conv_id, from_addr, from_name, subject, date_utc, flags
 FROM messages WHERE folder='INBOX' AND account='siue'
 ORDER BY date_utc DESC LIMIT 20
 
--- Thread history (for context before replying)
-SELECT message_id, from_addr, from_name, subject, date_utc, body_text
-FROM messages WHERE conv_id = 'abc123def456'
-ORDER BY date_utc ASC
+-- Thread history (for context before replying); bodies live in message_bodies
+SELECT m.message_id, m.from_addr, m.from_name, m.subject, m.date_utc, b.body_text
+FROM messages m LEFT JOIN message_bodies b ON b.message_id = m.message_id
+WHERE m.conv_id = 'abc123def456'
+ORDER BY m.date_utc ASC
 
--- Unread counts by folder
-SELECT folder, COUNT(*) as unread
-FROM messages WHERE flags NOT LIKE '%"seen"%'
+-- Unread counts by folder (is_unread mirrors the absence of "seen" in flags)
+SELECT folder, SUM(is_unread) as unread
+FROM messages
 GROUP BY folder
 
--- Full-text search
+-- Full-text search, best matches first (rank is bm25). Rank and limit
+-- inside messages_fts before joining back to messages; column filters such
+-- as from_addr:alice or subject:budget narrow the match set before ranking,
+-- and prefix terms (budg*) are served from a prefix index
+WITH hits AS (
+  SELECT rowid, rank FROM messages_fts
+  WHERE messages_fts MATCH 'quarterly report AND from_addr:siue'
+  ORDER BY rank LIMIT 20
+)
 SELECT m.message_id, m.from_addr, m.subject, m.date_utc
-FROM messages_fts f
-JOIN messages m ON m.rowid = f.rowid
-WHERE messages_fts MATCH 'quarterly report'
-ORDER BY m.date_utc DESC LIMIT 20
+FROM hits JOIN messages m ON m.rowid = hits.rowid
+ORDER BY hits.rank
 
 -- Priority senders (combine with clerk://config priorities)
 SELECT message_id, from_addr, subject, date_utc
 FROM messages
-WHERE from_addr LIKE '%@siue.edu%' AND flags NOT LIKE '%"seen"%'
+WHERE from_addr LIKE '%@siue.edu%' AND is_unread = 1
 ORDER BY date_utc DESC
 
 -- Attachments for a message
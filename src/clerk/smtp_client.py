@@ -85,14 +85,18 @@ class SmtpClient:
 
         password = self.config.get_password(self.account_name)
 
-        await aiosmtplib.send(
-            msg,
-            hostname=smtp.host,
-            port=smtp.port,
-            username=smtp.username,
-            password=password,
-            start_tls=smtp.starttls,
-        )
+        try:
+            await aiosmtplib.send(
+                msg,
+                hostname=smtp.host,
+                port=smtp.port,
+                username=smtp.username,
+                password=password,
+                start_tls=smtp.starttls,
+            )
+        except aiosmtplib.SMTPAuthenticationError:
+            self.config.forget_password(self.account_name)
+            raise
 
     def _get_xoauth2_token(self) -> str:
         """Fetch an access token for the configured OAuth protocol."""
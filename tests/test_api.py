@@ -1,5 +1,7 @@
 """Tests for ClerkAPI."""
 
+import threading
+import time
 from datetime import UTC, datetime
 from unittest.mock import MagicMock, patch
 
@@ -9,7 +11,7 @@ from clerk.api import ClerkAPI, get_api, html_to_text
 from clerk.cache import Cache
 from clerk.config import AccountConfig, ClerkConfig, FromAddress, ImapConfig, SmtpConfig
 from clerk.drafts import DraftManager
-from clerk.models import Address, Message
+from clerk.models import Address, Message, MessageFlag
 
 
 @pytest.fixture
@@ -181,6 +183,15 @@ class TestDrafts:
 
         assert draft.to[0].addr == "recipient@example.com"
 
+    def test_create_draft_parses_display_name(self, api):
+        draft = api.create_draft(
+            to=["Alice <alice@example.com>"],
+            subject="Test Subject",
+            body="Test body",
+        )
+
+        assert (draft.to[0].name, draft.to[0].addr) == ("Alice", "alice@example.com")
+
     def test_get_draft(self, api):
         """Test getting a draft."""
         created = api.create_draft(
@@ -393,8 +404,6 @@ class TestSetFlag:
     """set_flag is the single flag-mutation entry point; wrappers delegate here."""
 
     def test_mark_read_calls_set_flag(self, api, cache, sample_message, monkeypatch):
-        from clerk.models import MessageFlag
-
         cache.store_message(sample_message)
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
@@ -432,15 +441,55 @@ class TestSetFlag:
         mock_client.__exit__ = MagicMock(return_value=False)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
         monkeypatch.setattr(
-            cache, "update_flags", MagicMock(side_effect=RuntimeError("disk full"))
+            cache, "set_flag", MagicMock(side_effect=RuntimeError("disk full"))
         )
 
         # Must not raise — the IMAP side already succeeded.
         api.set_flag("<msg123@example.com>", MessageFlag.SEEN, True)
 
+    def test_mark_read_many_issues_one_store_per_folder(
+        self, api, cache, sample_message, monkeypatch
+    ):
+        from clerk.models import MessageFlag
+
+        cache.store_message(sample_message)
+        other = sample_message.model_copy(
+            update={"message_id": "<other@example.com>", "folder": "Archive"}
+        )
+        cache.store_message(other)
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+
+        api.mark_read_many(
+            ["<msg123@example.com>", "<other@example.com>", "<uncached@example.com>"]
+        )
+
+        calls = {c.args[0]: c.args[1] for c in mock_client.add_flags_many.call_args_list}
+        assert calls == {
+            "INBOX": ["<msg123@example.com>", "<uncached@example.com>"],
+            "Archive": ["<other@example.com>"],
+        }
+        assert MessageFlag.SEEN in cache.get_message("<other@example.com>").flags
+
+    def test_move_messages_single_client_call(self, api, cache, sample_message, monkeypatch):
+        cache.store_message(sample_message)
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+
+        api.move_messages(["<msg123@example.com>"], "Archive")
+
+        mock_client.move_messages.assert_called_once_with(
+            ["<msg123@example.com>"], "INBOX", "Archive"
+        )
+        assert cache.get_folder("<msg123@example.com>") == "Archive"
+
 
 class TestEnsureBody:
-    """M1: _ensure_body must not trust body_text=None if body_fetched_at is recent."""
+    """M1: body fetch must not trust body_text=None if body_fetched_at is recent."""
 
     def test_refetches_when_body_text_is_none_even_if_fresh(
         self, api, cache, sample_message, monkeypatch
@@ -455,14 +504,155 @@ class TestEnsureBody:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
-        mock_client.fetch_message_body.return_value = ("recovered body", None)
+        mock_client.fetch_message_bodies.return_value = {
+            "<msg123@example.com>": ("recovered body", None)
+        }
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
 
         msg = api.get_message("<msg123@example.com>")
 
         assert msg is not None
         assert msg.body_text == "recovered body"
-        mock_client.fetch_message_body.assert_called_once()
+        mock_client.fetch_message_bodies.assert_called_once()
+
+    def test_conversation_bodies_fetched_in_one_batch(self, api, cache, monkeypatch):
+        """All missing bodies in a folder share one client and one batched fetch."""
+        for i in range(3):
+            cache.store_message(
+                Message(
+                    message_id=f"<m{i}@example.com>",
+                    conv_id="conv1",
+                    account="test",
+                    folder="INBOX",
+                    **{"from": Address(addr="a@example.com")},
+                    date=datetime.now(UTC),
+                )
+            )
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.fetch_message_bodies.return_value = {
+            "<m0@example.com>": ("zero", None),
+            "<m2@example.com>": (None, "<p>two</p>"),
+        }
+        get_client = MagicMock(return_value=mock_client)
+        monkeypatch.setattr("clerk.api.get_imap_client", get_client)
+
+        conv = api.get_conversation("conv1")
+
+        get_client.assert_called_once_with("test")
+        mock_client.fetch_message_bodies.assert_called_once()
+        bodies = {m.message_id: m.body_text for m in conv.messages}
+        assert bodies == {
+            "<m0@example.com>": "zero",
+            "<m1@example.com>": None,
+            "<m2@example.com>": "two",
+        }
+        assert cache.get_message("<m2@example.com>").body_html == "<p>two</p>"
+        assert cache.get_message("<m1@example.com>").body_fetched_at is not None
+
+
+class TestServerThread:
+    """get_conversation(fresh=True) completes threads from server-side threading."""
+
+    def _store(self, cache, message_id, body_text="cached"):
+        msg = Message(
+            message_id=message_id,
+            conv_id="conv1",
+            account="test",
+            folder="INBOX",
+            **{"from": Address(addr="a@example.com")},
+            date=datetime.now(UTC),
+            body_text=body_text,
+            headers_fetched_at=datetime.now(UTC),
+            body_fetched_at=datetime.now(UTC),
+        )
+        cache.store_message(msg)
+        return msg
+
+    def _client(self, monkeypatch, capabilities):
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.side_effect = lambda name: name in capabilities
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+        return mock_client
+
+    def test_gmail_thread_adds_missing_messages(self, api, cache, monkeypatch):
+        root = self._store(cache, "<root@example.com>")
+        sibling = root.model_copy(
+            update={"message_id": "<late@example.com>", "conv_id": "other", "body_text": "new"}
+        )
+        mock_client = self._client(monkeypatch, {"X-GM-EXT-1"})
+        mock_client.fetch_gmail_thread.return_value = [root, sibling]
+
+        conv = api.get_conversation("conv1", fresh=True)
+
+        mock_client.fetch_gmail_thread.assert_called_once_with("<root@example.com>")
+        assert {m.message_id for m in conv.messages} == {
+            "<root@example.com>",
+            "<late@example.com>",
+        }
+        assert cache.get_message("<late@example.com>").conv_id == "conv1"
+
+    def test_thread_member_cached_elsewhere_keeps_its_folder(self, api, cache, monkeypatch):
+        root = self._store(cache, "<root@example.com>")
+        cached = root.model_copy(
+            update={
+                "message_id": "<cached@example.com>",
+                "conv_id": "other",
+                "flags": [MessageFlag.SEEN],
+            }
+        )
+        cache.store_message(cached)
+        all_mail = cached.model_copy(update={"folder": "[Gmail]/All Mail", "flags": []})
+        mock_client = self._client(monkeypatch, {"X-GM-EXT-1"})
+        mock_client.fetch_gmail_thread.return_value = [root, all_mail]
+
+        conv = api.get_conversation("conv1", fresh=True)
+
+        assert {m.message_id for m in conv.messages} == {
+            "<root@example.com>",
+            "<cached@example.com>",
+        }
+        stored = cache.get_message("<cached@example.com>")
+        assert stored.conv_id == "conv1"
+        assert stored.folder == "INBOX"
+        assert stored.flags == [MessageFlag.SEEN]
+
+    def test_thread_capable_server_uses_thread_per_folder(self, api, cache, monkeypatch):
+        root = self._store(cache, "<root@example.com>")
+        reply = root.model_copy(update={"message_id": "<reply@example.com>", "folder": "Sent"})
+        mock_client = self._client(monkeypatch, {"THREAD=REFERENCES"})
+        mock_client.fetch_referenced_thread.side_effect = lambda folder, ids: [reply]
+
+        conv = api.get_conversation("conv1", fresh=True)
+
+        mock_client.fetch_gmail_thread.assert_not_called()
+        mock_client.fetch_referenced_thread.assert_called_once_with(
+            "INBOX", ["<root@example.com>"]
+        )
+        assert len(conv.messages) == 2
+        assert cache.get_message("<reply@example.com>").folder == "Sent"
+
+    def test_non_gmail_server_keeps_cache_view(self, api, cache, monkeypatch):
+        self._store(cache, "<root@example.com>")
+        mock_client = self._client(monkeypatch, set())
+
+        conv = api.get_conversation("conv1", fresh=True)
+
+        mock_client.fetch_gmail_thread.assert_not_called()
+        assert [m.message_id for m in conv.messages] == ["<root@example.com>"]
+
+    def test_cached_read_skips_server(self, api, cache, monkeypatch):
+        self._store(cache, "<root@example.com>")
+        get_client = MagicMock()
+        monkeypatch.setattr("clerk.api.get_imap_client", get_client)
+
+        api.get_conversation("conv1")
+
+        get_client.assert_not_called()
 
 
 class TestGetApi:
@@ -496,6 +686,7 @@ class TestSyncFolder:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
         mock_client.fetch_messages_since_uid.return_value = ([], 0)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
 
@@ -522,6 +713,7 @@ class TestSyncFolder:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
         mock_client.fetch_messages_since_uid.return_value = ([msg], 100)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
 
@@ -539,6 +731,7 @@ class TestSyncFolder:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
         mock_client.fetch_messages_since_uid.return_value = ([], 50)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
 
@@ -557,6 +750,7 @@ class TestSyncFolder:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
         mock_client.fetch_messages_since_uid.return_value = ([], 0)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
 
@@ -575,6 +769,7 @@ class TestSyncFolder:
         mock_client = MagicMock()
         mock_client.__enter__ = MagicMock(return_value=mock_client)
         mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
         # highest_uid == since_uid means no new messages
         mock_client.fetch_messages_since_uid.return_value = ([], 50)
         monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
@@ -584,3 +779,143 @@ class TestSyncFolder:
         state = cache.get_sync_state("test", "INBOX")
         assert state is not None
         assert state["last_uid"] == 50
+
+    def test_condstore_sync_applies_flag_changes(self, api, cache, sample_message, monkeypatch):
+        """With CONDSTORE, flags changed since the last MODSEQ are pulled and stored."""
+        from clerk.models import MessageFlag
+
+        cache.store_message(sample_message)
+        cache.set_sync_state("test", "INBOX", 50, uidvalidity=7, highest_modseq=100)
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = True
+        mock_client.get_folder_state.return_value = (7, 120)
+        mock_client.fetch_messages_since_uid.return_value = ([], 50)
+        mock_client.fetch_flag_changes.return_value = {
+            "<msg123@example.com>": [MessageFlag.FLAGGED]
+        }
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+
+        result = api.sync_folder(account="test", folder="INBOX")
+
+        mock_client.fetch_flag_changes.assert_called_once_with("INBOX", 50, 100)
+        assert result["flags_updated"] == 1
+        assert cache.get_message("<msg123@example.com>").flags == [MessageFlag.FLAGGED]
+        assert cache.get_sync_state("test", "INBOX")["highest_modseq"] == 120
+
+    def test_uidvalidity_change_restarts_sync(self, api, cache, monkeypatch):
+        """A new UIDVALIDITY voids the stored last_uid."""
+        cache.set_sync_state("test", "INBOX", 50, uidvalidity=7, highest_modseq=100)
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = True
+        mock_client.get_folder_state.return_value = (8, 5)
+        mock_client.fetch_messages_since_uid.return_value = ([], 0)
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+
+        api.sync_folder(account="test", folder="INBOX")
+
+        mock_client.fetch_messages_since_uid.assert_called_once_with(
+            folder="INBOX",
+            since_uid=0,
+            fetch_bodies=False,
+        )
+        mock_client.fetch_flag_changes.assert_not_called()
+        assert cache.get_sync_state("test", "INBOX")["uidvalidity"] == 8
+
+    def test_prefetch_bodies_warms_newest_messages(
+        self, api, cache, sample_message, monkeypatch
+    ):
+        """prefetch_bodies hands the newest synced messages to a background fetch."""
+        older = sample_message.model_copy(
+            update={"message_id": "<old@example.com>", "date": datetime(2020, 1, 1, tzinfo=UTC)}
+        )
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.has_capability.return_value = False
+        mock_client.fetch_messages_since_uid.return_value = ([older, sample_message], 2)
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda _: mock_client)
+
+        prefetched: list[list[str]] = []
+
+        class InlineThread:
+            def __init__(self, target, args, daemon):
+                self.run = lambda: target(*args)
+
+            def start(self):
+                self.run()
+
+        monkeypatch.setattr("clerk.api.threading.Thread", InlineThread)
+        monkeypatch.setattr(
+            api, "_ensure_bodies",
+            lambda msgs, fresh: prefetched.append([m.message_id for m in msgs]),
+        )
+
+        api.sync_folder(account="test", folder="INBOX", prefetch_bodies=1)
+
+        assert prefetched == [["<msg123@example.com>"]]
+
+
+class TestGetStatus:
+    """Tests for get_status account probes."""
+
+    def test_probes_every_account_in_config_order(self, api, mock_config, monkeypatch):
+        """A failing account is reported without hiding the healthy ones."""
+        mock_config.accounts["broken"] = mock_config.accounts["test"].model_copy()
+
+        mock_client = MagicMock()
+        mock_client.__enter__ = MagicMock(return_value=mock_client)
+        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client.list_folders.return_value = ["INBOX", "Sent"]
+
+        def fake_get_imap_client(name):
+            if name == "broken":
+                raise ConnectionError("auth failed")
+            return mock_client
+
+        monkeypatch.setattr("clerk.api.get_imap_client", fake_get_imap_client)
+
+        status = api.get_status()
+
+        assert list(status["accounts"]) == ["test", "broken"]
+        assert status["accounts"]["test"] == {"connected": True, "folders": 2}
+        assert status["accounts"]["broken"] == {"connected": False, "error": "auth failed"}
+
+    def test_slow_account_is_reported_as_timeout(self, api, mock_config, monkeypatch):
+        release = threading.Event()
+
+        def hanging_get_imap_client(name):
+            release.wait()
+            raise ConnectionError("gave up")
+
+        monkeypatch.setattr("clerk.api.get_imap_client", hanging_get_imap_client)
+        monkeypatch.setattr("clerk.api.STATUS_PROBE_TIMEOUT_S", 0.05)
+
+        try:
+            status = api.get_status()
+        finally:
+            release.set()
+
+        assert status["accounts"]["test"] == {"connected": False, "error": "timeout"}
+
+    def test_blocked_probe_does_not_hold_up_return_or_exit(self, api, mock_config, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr("clerk.api.get_imap_client", lambda name: release.wait())
+        monkeypatch.setattr("clerk.api.STATUS_PROBE_TIMEOUT_S", 0.05)
+
+        try:
+            start = time.monotonic()
+            api.get_status()
+            elapsed = time.monotonic() - start
+            stuck = [t for t in threading.enumerate() if t.name.startswith("clerk-status-")]
+        finally:
+            release.set()
+
+        assert elapsed < 1.0
+        # Interpreter shutdown does not join daemon threads
+        assert stuck and all(t.daemon for t in stuck)
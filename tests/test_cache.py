@@ -38,6 +38,147 @@ def sample_message():
     )
 
 
+class TestCachePragmas:
+    def test_uses_wal_journal(self, cache):
+        with cache._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_cache_size_from_config(self, tmp_path):
+        cache = Cache(tmp_path / "sized.db", cache_size_mb=16)
+        with cache._connect() as conn:
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16 * 1024
+
+    def test_connection_is_reused_and_rolls_back_on_error(self, cache, sample_message):
+        with cache._connect() as first:
+            pass
+        with pytest.raises(RuntimeError), cache._connect(write=True) as conn:
+            conn.execute(cache._STORE_SQL, cache._message_params(sample_message))
+            raise RuntimeError("boom")
+
+        assert conn is first
+        assert cache.get_message(sample_message.message_id) is None
+
+    def test_concurrent_writers_from_threads(self, cache, sample_message):
+        from concurrent.futures import ThreadPoolExecutor
+
+        messages = [
+            sample_message.model_copy(update={"message_id": f"<t{i}@example.com>"})
+            for i in range(40)
+        ]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(cache.store_message, messages))
+
+        assert cache.get_stats().message_count == 40
+
+    def test_large_batch_refreshes_planner_stats(self, cache, sample_message, monkeypatch):
+        monkeypatch.setattr("clerk.cache.ANALYZE_AFTER_ROWS", 2)
+        batch = [
+            sample_message.model_copy(update={"message_id": f"<a{i}@example.com>"})
+            for i in range(2)
+        ]
+        cache.store_messages(batch)
+
+        rows = cache.execute_readonly_sql("SELECT DISTINCT tbl FROM sqlite_stat1")
+        assert {"tbl": "messages"} in rows
+
+    def test_close_reopens_on_next_use(self, cache, sample_message):
+        cache.store_message(sample_message)
+
+        cache.close()
+
+        assert cache.get_message(sample_message.message_id) is not None
+
+
+class TestBodySplit:
+    def test_header_only_store_keeps_body(self, cache, sample_message):
+        cache.store_message(sample_message)
+        headers_only = sample_message.model_copy(
+            update={"body_text": None, "body_html": None, "body_fetched_at": None}
+        )
+
+        cache.store_message(headers_only)
+
+        assert cache.get_message(sample_message.message_id).body_text == "This is the body text"
+
+    def test_conversation_reads_skip_html_when_text_exists(self, cache, sample_message):
+        html_only = sample_message.model_copy(
+            update={"message_id": "<html@example.com>", "body_text": None}
+        )
+        cache.store_messages([sample_message, html_only])
+
+        conv = cache.get_conversation(sample_message.conv_id)
+
+        html = {m.message_id: m.body_html for m in conv.messages}
+        assert html[sample_message.message_id] is None
+        assert html["<html@example.com>"] == sample_message.body_html
+        assert cache.get_message(sample_message.message_id).body_html is not None
+
+    def test_body_is_searchable_and_deleted_with_message(self, cache, sample_message):
+        cache.store_message(sample_message)
+        cache.update_body(sample_message.message_id, "quarterly numbers", None)
+
+        rows = cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'quarterly'"
+        )
+        assert rows == [{"message_id": sample_message.message_id}]
+
+        cache.delete_message(sample_message.message_id)
+        assert cache.execute_readonly_sql("SELECT * FROM message_bodies") == []
+
+    def test_migrates_inline_bodies(self, tmp_path):
+        import sqlite3
+
+        db_path = tmp_path / "old.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            """
+            CREATE TABLE messages (
+                message_id TEXT PRIMARY KEY, conv_id TEXT NOT NULL,
+                account TEXT NOT NULL, folder TEXT NOT NULL,
+                from_addr TEXT NOT NULL, from_name TEXT DEFAULT '',
+                to_json TEXT DEFAULT '[]', cc_json TEXT DEFAULT '[]',
+                reply_to_json TEXT DEFAULT '[]', subject TEXT DEFAULT '',
+                date_utc TEXT NOT NULL, body_text TEXT, body_html TEXT,
+                flags TEXT DEFAULT '[]', attachments_json TEXT DEFAULT '[]',
+                in_reply_to TEXT, references_json TEXT DEFAULT '[]',
+                headers_fetched_at TEXT NOT NULL, body_fetched_at TEXT
+            );
+            INSERT INTO messages (message_id, conv_id, account, folder, from_addr,
+                                  date_utc, body_text, headers_fetched_at, body_fetched_at)
+            VALUES ('<old@example.com>', 'c1', 'a', 'INBOX', 'x@example.com',
+                    '2024-01-01T00:00:00+00:00', 'legacy body',
+                    '2024-01-01T00:00:00+00:00', '2024-01-01T00:00:00+00:00');
+            """
+        )
+        conn.close()
+
+        cache = Cache(db_path)
+
+        assert cache.get_message("<old@example.com>").body_text == "legacy body"
+        rows = cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'legacy'"
+        )
+        assert rows == [{"message_id": "<old@example.com>"}]
+
+    def test_prefix_queries_match(self, cache, sample_message):
+        cache.store_message(sample_message)
+
+        rows = cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'from_addr:sen*'"
+        )
+        assert rows == [{"message_id": sample_message.message_id}]
+
+    def test_search_folds_diacritics(self, cache, sample_message):
+        sample_message.subject = "Café meeting"
+        cache.store_message(sample_message)
+
+        rows = cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'cafe' "
+            "ORDER BY bm25(messages_fts)"
+        )
+        assert rows == [{"message_id": sample_message.message_id}]
+
+
 class TestCacheBasics:
     def test_store_and_retrieve_message(self, cache, sample_message):
         cache.store_message(sample_message)
@@ -49,6 +190,17 @@ class TestCacheBasics:
         assert retrieved.from_.addr == sample_message.from_.addr
         assert retrieved.body_text == sample_message.body_text
 
+    def test_store_messages_batch(self, cache, sample_message):
+        second = sample_message.model_copy(
+            update={"message_id": "<second@example.com>", "subject": "Second"}
+        )
+
+        cache.store_messages([sample_message, second])
+
+        assert cache.get_message(sample_message.message_id) is not None
+        assert cache.get_message("<second@example.com>").subject == "Second"
+        assert cache.get_stats().message_count == 2
+
     def test_get_nonexistent_message(self, cache):
         result = cache.get_message("<nonexistent@example.com>")
         assert result is None
@@ -107,6 +259,8 @@ class TestCacheConversations:
         # Messages should be sorted by date
         assert conv.messages[0].message_id == "<msg1@example.com>"
         assert conv.messages[1].message_id == "<msg2@example.com>"
+        # Repeated account/folder values are shared rather than copied per row
+        assert conv.messages[0].folder is conv.messages[1].folder
 
     def test_get_nonexistent_conversation(self, cache):
         result = cache.get_conversation("nonexistent")
@@ -134,6 +288,69 @@ class TestCacheConversations:
         # Should be sorted by latest date descending
         assert convs[0].conv_id == "conv_2"
 
+    def test_list_conversations_snippet_is_latest_body(self, cache):
+        for i, body in enumerate(["Older reply", "Newest reply " * 20]):
+            cache.store_message(
+                Message(
+                    message_id=f"<snip{i}@example.com>",
+                    conv_id="conv_snip",
+                    account="test",
+                    folder="INBOX",
+                    **{"from": Address(addr="alice@example.com")},
+                    date=datetime(2025, 1, 1, 10 + i, 0, 0),
+                    body_text=body,
+                    flags=[],
+                    headers_fetched_at=datetime.now(UTC),
+                )
+            )
+
+        [summary] = cache.list_conversations(account="test", limit=1)
+        assert summary.snippet == ("Newest reply " * 20)[:100]
+        assert summary.message_count == 2
+
+    def test_list_conversations_scopes_senders_to_folder(self, cache):
+        """Participants and snippet come only from the listed folder."""
+        for i, (folder, sender) in enumerate(
+            [("INBOX", "alice@example.com"), ("Sent", "me@example.com")]
+        ):
+            cache.store_message(
+                Message(
+                    message_id=f"<scope{i}@example.com>",
+                    conv_id="conv_scope",
+                    account="test",
+                    folder=folder,
+                    **{"from": Address(addr=sender)},
+                    date=datetime(2025, 1, 1, 10 + i, 0, 0),
+                    body_text=f"{folder} body",
+                    flags=[],
+                    headers_fetched_at=datetime.now(UTC),
+                )
+            )
+
+        [summary] = cache.list_conversations(account="test", folder="INBOX")
+        assert summary.participants == ["alice@example.com"]
+        assert summary.snippet == "INBOX body"
+        assert summary.message_count == 1
+
+    def test_list_conversations_caps_participants(self, cache):
+        for i in range(8):
+            cache.store_message(
+                Message(
+                    message_id=f"<many{i}@example.com>",
+                    conv_id="conv_many",
+                    account="test",
+                    folder="INBOX",
+                    **{"from": Address(addr=f"user{i}@example.com")},
+                    date=datetime(2025, 1, 1, i, 0, 0),
+                    flags=[],
+                    headers_fetched_at=datetime.now(UTC),
+                )
+            )
+
+        [summary] = cache.list_conversations(account="test")
+        assert summary.message_count == 8
+        assert sorted(summary.participants) == [f"user{i}@example.com" for i in range(3, 8)]
+
     def test_list_unread_only(self, cache):
         # Create read and unread messages
         msg_read = Message(
@@ -166,6 +383,32 @@ class TestCacheConversations:
         assert len(unread_convs) == 1
         assert unread_convs[0].conv_id == "conv_unread"
 
+    def test_unread_count_follows_flag_changes(self, cache, sample_message):
+        sample_message.flags = []
+        cache.store_message(sample_message)
+
+        cache.set_flag(sample_message.message_id, MessageFlag.SEEN, True)
+        assert cache.list_conversations(unread_only=True) == []
+
+        cache.update_flags(sample_message.message_id, [MessageFlag.FLAGGED])
+        [summary] = cache.list_conversations(unread_only=True)
+        assert summary.unread_count == 1
+
+    def test_backfills_unread_column(self, tmp_path, sample_message):
+        import sqlite3
+
+        db_path = tmp_path / "old.db"
+        Cache(db_path).store_message(sample_message)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX idx_messages_unread")
+        conn.execute("ALTER TABLE messages DROP COLUMN is_unread")
+        conn.commit()
+        conn.close()
+
+        [summary] = Cache(db_path).list_conversations()
+
+        assert summary.unread_count == 0  # sample_message is seen
+
 
 class TestCacheFlags:
     def test_update_flags(self, cache, sample_message):
@@ -179,6 +422,38 @@ class TestCacheFlags:
         assert MessageFlag.SEEN in retrieved.flags
 
 
+    def test_set_flag_adds_once_and_removes(self, cache, sample_message):
+        sample_message.flags = [MessageFlag.SEEN]
+        cache.store_message(sample_message)
+
+        cache.set_flag(sample_message.message_id, MessageFlag.FLAGGED, True)
+        cache.set_flag(sample_message.message_id, MessageFlag.FLAGGED, True)
+        assert cache.get_message(sample_message.message_id).flags == [
+            MessageFlag.SEEN,
+            MessageFlag.FLAGGED,
+        ]
+
+        cache.set_flag(sample_message.message_id, MessageFlag.SEEN, False)
+        assert cache.get_message(sample_message.message_id).flags == [MessageFlag.FLAGGED]
+
+    def test_get_folder(self, cache, sample_message):
+        cache.store_message(sample_message)
+
+        assert cache.get_folder(sample_message.message_id) == "INBOX"
+        assert cache.get_folder("<missing@example.com>") is None
+
+    def test_bulk_flag_and_move(self, cache, sample_message):
+        other = sample_message.model_copy(update={"message_id": "<other@example.com>"})
+        cache.store_messages([sample_message, other])
+        ids = [sample_message.message_id, other.message_id]
+
+        cache.set_flag_many(ids, MessageFlag.SEEN, True)
+        cache.move_messages(ids, "Archive")
+
+        assert cache.get_folders([*ids, "<missing@example.com>"]) == dict.fromkeys(ids, "Archive")
+        assert all(MessageFlag.SEEN in cache.get_message(i).flags for i in ids)
+
+
 class TestCacheBody:
     def test_update_body(self, cache):
         msg = Message(
@@ -200,6 +475,33 @@ class TestCacheBody:
         assert retrieved.body_html == "<p>New body</p>"
         assert retrieved.body_fetched_at is not None
 
+    def test_update_bodies(self, cache):
+        for i in range(2):
+            cache.store_message(
+                Message(
+                    message_id=f"<b{i}@example.com>",
+                    conv_id="conv1",
+                    account="test",
+                    folder="INBOX",
+                    **{"from": Address(addr="a@example.com")},
+                    date=datetime.now(UTC),
+                    headers_fetched_at=datetime.now(UTC),
+                )
+            )
+
+        cache.update_bodies(
+            {
+                "<b0@example.com>": ("Body zero", None),
+                "<b1@example.com>": (None, "<p>Body one</p>"),
+            }
+        )
+
+        first = cache.get_message("<b0@example.com>")
+        second = cache.get_message("<b1@example.com>")
+        assert first.body_text == "Body zero"
+        assert second.body_html == "<p>Body one</p>"
+        assert first.body_fetched_at == second.body_fetched_at
+
 
 class TestCacheFreshness:
     def test_is_fresh_true(self, cache, sample_message):
@@ -260,6 +562,20 @@ class TestCacheClear:
         assert cache.get_message(sample_message.message_id) is None
         stats = cache.get_stats()
         assert stats.message_count == 0
+        assert cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'body'"
+        ) == []
+
+    def test_clear_keeps_delete_trigger(self, cache, sample_message):
+        cache.clear()
+        cache.store_message(sample_message)
+        cache.prune_old_messages(0)
+
+        # messages_ad is back: the pruned row left the index and bodies too
+        assert cache.execute_readonly_sql(
+            "SELECT message_id FROM messages_fts WHERE messages_fts MATCH 'body'"
+        ) == []
+        assert cache.execute_readonly_sql("SELECT * FROM message_bodies") == []
 
 
 class TestPrefixMatching:
@@ -19,6 +19,19 @@ class TestVersion:
         assert "clerk" in result.stdout
 
 
+class TestOutputJson:
+    def test_text_only_stdout(self, monkeypatch):
+        import io
+
+        from clerk.cli import output_json
+
+        out = io.StringIO()
+        monkeypatch.setattr("sys.stdout", out)
+        output_json({1: "one", "when": datetime(2025, 1, 1)})
+
+        assert json.loads(out.getvalue()) == {"1": "one", "when": "2025-01-01T00:00:00"}
+
+
 class TestStatus:
     @patch("clerk.cli.get_config")
     def test_status_no_accounts(self, mock_config):
@@ -515,29 +528,27 @@ class TestMicrosoft365Accounts:
 
 
 class TestHostGuessing:
-    def test_guess_imap_host_gmail(self):
-        from clerk.cli import _guess_imap_host
-
-        assert _guess_imap_host("user@gmail.com") == "imap.gmail.com"
-        assert _guess_imap_host("user@googlemail.com") == "imap.gmail.com"
+    def test_guess_hosts_gmail(self):
+        from clerk.cli import _guess_hosts
 
-    def test_guess_imap_host_outlook(self):
-        from clerk.cli import _guess_imap_host
+        assert _guess_hosts("user@gmail.com") == ("imap.gmail.com", "smtp.gmail.com")
+        assert _guess_hosts("user@googlemail.com") == ("imap.gmail.com", "smtp.gmail.com")
 
-        assert _guess_imap_host("user@outlook.com") == "outlook.office365.com"
-        assert _guess_imap_host("user@hotmail.com") == "outlook.office365.com"
+    def test_guess_hosts_outlook(self):
+        from clerk.cli import _guess_hosts
 
-    def test_guess_imap_host_unknown(self):
-        from clerk.cli import _guess_imap_host
+        assert _guess_hosts("user@outlook.com")[0] == "outlook.office365.com"
+        assert _guess_hosts("user@hotmail.com")[0] == "outlook.office365.com"
 
-        assert _guess_imap_host("user@custom-domain.org") == "imap.custom-domain.org"
+    def test_guess_hosts_unknown(self):
+        from clerk.cli import _guess_hosts
 
-    def test_guess_smtp_host_gmail(self):
-        from clerk.cli import _guess_smtp_host
-
-        assert _guess_smtp_host("user@gmail.com") == "smtp.gmail.com"
+        assert _guess_hosts("user@custom-domain.org") == (
+            "imap.custom-domain.org",
+            "smtp.custom-domain.org",
+        )
 
-    def test_guess_smtp_host_unknown(self):
-        from clerk.cli import _guess_smtp_host
+    def test_guess_hosts_provider_subdomain(self):
+        from clerk.cli import _guess_hosts
 
-        assert _guess_smtp_host("user@mydomain.com") == "smtp.mydomain.com"
+        assert _guess_hosts("user@Team.Fastmail.com") == ("imap.fastmail.com", "smtp.fastmail.com")
@@ -13,6 +13,7 @@ from clerk.config import (
     SendConfig,
     SmtpConfig,
     delete_m365_token_cache,
+    ensure_dirs,
     get_m365_token_cache,
     load_config,
     save_m365_token_cache,
@@ -100,6 +101,7 @@ class TestCacheConfig:
         assert cache.window_days == 7
         assert cache.inbox_freshness_min == 5
         assert cache.body_freshness_min == 60
+        assert cache.cache_size_mb == 64
 
     def test_custom_values(self):
         cache = CacheConfig(window_days=14, inbox_freshness_min=10)
@@ -304,6 +306,45 @@ class TestLoadConfig:
         assert config.cache.window_days == 14
         assert config.send.rate_limit == 10
 
+    def test_reload_skips_unchanged_file(self, tmp_path, monkeypatch):
+        """An unchanged file is served from cache; a rewrite is picked up."""
+        from clerk.config import save_config
+
+        config_path = tmp_path / "config.yaml"
+        save_config(ClerkConfig(cache=CacheConfig(window_days=14)), config_path)
+
+        first = load_config(config_path)
+        with monkeypatch.context() as m:
+            m.setattr(yaml, "load", lambda *_, **__: pytest.fail("config re-parsed"))
+            assert load_config(config_path).cache.window_days == 14
+
+        save_config(ClerkConfig(cache=CacheConfig(window_days=365)), config_path)
+        assert load_config(config_path).cache.window_days == 365
+        assert first.cache.window_days == 14
+
+    def test_loads_do_not_share_mutations(self, tmp_path):
+        """Mutating a loaded config (without saving) does not affect later loads."""
+        from clerk.config import save_config
+
+        config_path = tmp_path / "config.yaml"
+        save_config(ClerkConfig(cache=CacheConfig(window_days=14)), config_path)
+
+        load_config(config_path).cache.window_days = 99
+        assert load_config(config_path).cache.window_days == 14
+
+    def test_same_size_save_is_seen(self, tmp_path):
+        """A save that keeps the file size (and possibly mtime) is still reloaded."""
+        from clerk.config import save_config
+
+        config_path = tmp_path / "config.yaml"
+        save_config(ClerkConfig(cache=CacheConfig(window_days=14)), config_path)
+        size = config_path.stat().st_size
+        assert load_config(config_path).cache.window_days == 14
+
+        save_config(ClerkConfig(cache=CacheConfig(window_days=15)), config_path)
+        assert config_path.stat().st_size == size
+        assert load_config(config_path).cache.window_days == 15
+
 
 class TestSaveConfig:
     def test_save_config_creates_file(self, tmp_path):
@@ -370,6 +411,26 @@ class TestSaveConfig:
         assert loaded.cache.window_days == 14
         assert loaded.send.rate_limit == 50
 
+    def test_save_config_round_trips_paths(self, tmp_path):
+        """Path fields are written as plain strings the safe loader can read."""
+        from clerk.config import OAuthConfig, save_config
+
+        original = ClerkConfig(
+            accounts={
+                "gmail": AccountConfig(
+                    protocol="gmail",
+                    oauth=OAuthConfig(client_id_file=tmp_path / "client.json"),
+                    **{"from": FromAddress(address="me@gmail.com")},
+                ),
+            },
+        )
+
+        config_path = tmp_path / "config.yaml"
+        save_config(original, config_path)
+        loaded = load_config(config_path)
+
+        assert loaded.accounts["gmail"].oauth.client_id_file == tmp_path / "client.json"
+
 
 class TestOAuthTokenStorage:
     @pytest.fixture
@@ -393,6 +454,9 @@ class TestOAuthTokenStorage:
 
         import keyring
 
+        import clerk.config
+
+        monkeypatch.setattr(clerk.config, "_keyring_cache", {})
         monkeypatch.setattr(keyring, "get_password", mock_get_password)
         monkeypatch.setattr(keyring, "set_password", mock_set_password)
         monkeypatch.setattr(keyring, "delete_password", mock_delete_password)
@@ -456,6 +520,9 @@ class TestPasswordStorage:
 
         import keyring
 
+        import clerk.config
+
+        monkeypatch.setattr(clerk.config, "_keyring_cache", {})
         monkeypatch.setattr(keyring, "get_password", mock_get_password)
         monkeypatch.setattr(keyring, "set_password", mock_set_password)
         monkeypatch.setattr(keyring, "delete_password", mock_delete_password)
@@ -472,6 +539,25 @@ class TestPasswordStorage:
         delete_password("test-account")
         assert "clerk:test-account" not in mock_keyring
 
+    def test_password_read_once_per_process(self, mock_keyring, monkeypatch):
+        """Later lookups are served from memory until the password changes."""
+        import keyring
+
+        from clerk.config import save_password
+
+        acc = AccountConfig(
+            protocol="microsoft365",
+            **{"from": FromAddress(address="user@ex.com")},
+        )
+        mock_keyring["clerk:test-account"] = "secret123"
+        assert acc.get_password("test-account") == "secret123"
+
+        monkeypatch.setattr(keyring, "get_password", lambda *_: pytest.fail("keyring re-read"))
+        assert acc.get_password("test-account") == "secret123"
+
+        save_password("test-account", "changed")
+        assert acc.get_password("test-account") == "changed"
+
     def test_delete_password_not_found(self, mock_keyring):
         """Test deleting non-existent password doesn't raise."""
         from clerk.config import delete_password
@@ -480,6 +566,103 @@ class TestPasswordStorage:
         delete_password("nonexistent")
 
 
+class TestPasswordCommand:
+    @pytest.fixture
+    def account(self, monkeypatch):
+        import keyring
+
+        import clerk.config
+
+        monkeypatch.setattr(clerk.config, "_password_cmd_cache", {})
+        monkeypatch.setattr(keyring, "get_password", lambda *_: None)
+        return AccountConfig(
+            protocol="microsoft365",
+            password_cmd="echo secret123",
+            **{"from": FromAddress(address="user@ex.com")},
+        )
+
+    def test_runs_once_without_shell(self, account, monkeypatch):
+        import subprocess
+
+        calls = []
+        real_run = subprocess.run
+
+        def counting_run(args, **kwargs):
+            calls.append((args, kwargs["shell"]))
+            return real_run(args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "run", counting_run)
+
+        assert account.get_password("test-account") == "secret123"
+        assert account.get_password("test-account") == "secret123"
+        assert calls == [(["echo", "secret123"], False)]
+
+    def test_env_assignment_prefix_uses_shell(self, account):
+        account.password_cmd = "PW_UNUSED=1 echo secret123"
+        assert account.get_password("test-account") == "secret123"
+
+    def test_rejected_login_forgets_password(self, account):
+        from unittest.mock import patch
+
+        from imapclient.exceptions import LoginError
+
+        import clerk.config
+        from clerk.config import ImapConfig, SmtpConfig
+        from clerk.imap_client import ImapClient
+
+        account.protocol = "imap"
+        account.imap = ImapConfig(host="imap.ex.com", username="user@ex.com")
+        account.smtp = SmtpConfig(host="smtp.ex.com", username="user@ex.com")
+
+        with patch("clerk.imap_client.IMAPClient") as mock_imap_cls:
+            mock_imap_cls.return_value.login.side_effect = LoginError("bad password")
+            with pytest.raises(LoginError):
+                ImapClient("test-account", account).connect()
+
+        # The rejected password is not reused; the next lookup reruns the command
+        assert clerk.config._password_cmd_cache == {}
+
+    def test_missing_command(self, account):
+        account.password_cmd = "clerk-no-such-command"
+        with pytest.raises(ValueError, match="Password command failed"):
+            account.get_password("test-account")
+
+
+class TestPasswordFile:
+    @pytest.fixture
+    def account(self, tmp_path, monkeypatch):
+        import keyring
+
+        monkeypatch.setattr(keyring, "get_password", lambda *_: None)
+        pw_file = tmp_path / "pw"
+        pw_file.write_text("secret123\n")
+        pw_file.chmod(0o600)
+        return AccountConfig(
+            protocol="microsoft365",
+            password_file=pw_file,
+            **{"from": FromAddress(address="user@ex.com")},
+        )
+
+    def test_reread_only_when_changed(self, account, monkeypatch):
+        from pathlib import Path
+
+        assert account.get_password("test-account") == "secret123"
+
+        real_read = Path.read_text
+        monkeypatch.setattr(Path, "read_text", lambda *_: pytest.fail("file re-read"))
+        assert account.get_password("test-account") == "secret123"
+
+        monkeypatch.setattr(Path, "read_text", real_read)
+        account.password_file.write_text("changed-password\n")
+        assert account.get_password("test-account") == "changed-password"
+
+    def test_insecure_permissions_checked_on_every_call(self, account):
+        assert account.get_password("test-account") == "secret123"
+        account.password_file.chmod(0o644)
+        with pytest.raises(ValueError, match="insecure permissions"):
+            account.get_password("test-account")
+
+
 class TestM365TokenStorage:
     @pytest.fixture
     def mock_keyring(self, monkeypatch):
@@ -533,3 +716,16 @@ class TestM365TokenStorage:
         """Test deleting non-existent M365 token cache doesn't raise."""
         # Should not raise
         delete_m365_token_cache("nonexistent")
+
+
+class TestEnsureDirs:
+    def test_creates_dirs_per_location(self, tmp_path, monkeypatch):
+        for name in ("a", "b"):
+            monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / name / "config"))
+            monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / name / "data"))
+
+            ensure_dirs()
+            ensure_dirs()
+
+            assert (tmp_path / name / "config" / "clerk").is_dir()
+            assert (tmp_path / name / "data" / "clerk" / "oauth_tokens").is_dir()
@@ -0,0 +1,54 @@
+"""Tests for batched IMAP FETCH, STORE and COPY commands."""
+
+from unittest.mock import MagicMock
+
+from clerk.config import AccountConfig, FromAddress
+from clerk.imap_client import ImapClient, _uid_set
+
+
+def _client(imap: MagicMock) -> ImapClient:
+    client = ImapClient(
+        "siue",
+        AccountConfig(
+            protocol="microsoft365",
+            **{"from": FromAddress(address="user@siue.edu", name="Test User")},
+        ),
+    )
+    client._client = imap
+    return client
+
+
+def test_uid_set_compresses_runs():
+    assert _uid_set([9, 1, 2, 3, 5, 10, 2]) == "1:3,5,9:10"
+    assert _uid_set([42]) == "42"
+
+
+def test_incremental_fetch_skips_search_and_drops_seen_uid():
+    imap = MagicMock()
+    imap.select_folder.return_value = {b"EXISTS": 3, b"UIDNEXT": 60}
+    # "51:*" returns the highest UID even when nothing newer exists
+    imap.fetch.return_value = {50: {}}
+
+    messages, highest = _client(imap).fetch_messages_since_uid("INBOX", since_uid=50)
+
+    assert (messages, highest) == ([], 50)
+    imap.search.assert_not_called()
+    assert imap.fetch.call_args.args[0] == "51:*"
+
+
+def test_incremental_fetch_skipped_when_uidnext_unchanged():
+    imap = MagicMock()
+    imap.select_folder.return_value = {b"EXISTS": 3, b"UIDNEXT": 51}
+
+    assert _client(imap).fetch_messages_since_uid("INBOX", since_uid=50) == ([], 50)
+    imap.fetch.assert_not_called()
+
+
+def test_move_messages_sends_compressed_uid_set():
+    imap = MagicMock()
+
+    _client(imap).move_messages(["<1@local>", "<2@local>", "<3@local>"], "INBOX", "Archive")
+
+    imap.copy.assert_called_once_with("1:3", "Archive")
+    imap.add_flags.assert_called_once_with("1:3", ["\\Deleted"])
+    imap.expunge.assert_called_once()
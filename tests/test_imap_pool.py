@@ -0,0 +1,64 @@
+"""Tests for the pooled IMAP session checkout."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from clerk.config import AccountConfig, FromAddress
+from clerk.imap_client import ImapConnectionPool
+
+
+def _config() -> AccountConfig:
+    return AccountConfig(
+        protocol="microsoft365",
+        **{"from": FromAddress(address="user@siue.edu", name="Test User")},
+    )
+
+
+@patch("clerk.imap_client.IMAPClient")
+@patch("clerk.microsoft365.get_m365_access_token", return_value="token")
+class TestImapConnectionPool:
+    def test_session_is_reused_after_exit(self, _token, mock_imap_cls):
+        pool = ImapConnectionPool()
+        config = _config()
+
+        with pool.acquire("siue", config) as first:
+            pass
+        with pool.acquire("siue", config) as second:
+            pass
+
+        assert first is second
+        mock_imap_cls.assert_called_once()
+        mock_imap_cls.return_value.logout.assert_not_called()
+
+    def test_failed_block_drops_session(self, _token, mock_imap_cls):
+        pool = ImapConnectionPool()
+        config = _config()
+
+        with pytest.raises(RuntimeError), pool.acquire("siue", config):
+            raise RuntimeError("boom")
+        with pool.acquire("siue", config):
+            pass
+
+        assert mock_imap_cls.call_count == 2
+
+    def test_dead_idle_session_is_replaced(self, _token, mock_imap_cls):
+        dead, live = MagicMock(), MagicMock()
+        dead.noop.side_effect = OSError("connection reset")
+        mock_imap_cls.side_effect = [dead, live]
+        pool = ImapConnectionPool(noop_after=0)
+        config = _config()
+
+        with pool.acquire("siue", config):
+            pass
+        with pool.acquire("siue", config) as client:
+            assert client.client is live
+
+    def test_close_all_logs_out(self, _token, mock_imap_cls):
+        pool = ImapConnectionPool()
+        with pool.acquire("siue", _config()):
+            pass
+
+        pool.close_all()
+
+        mock_imap_cls.return_value.logout.assert_called_once()
@@ -277,7 +277,9 @@ class TestClerkSync:
 
         result = clerk_sync(account="test")
         assert result["synced"] == 5
-        mock_api.sync_folder.assert_called_once_with(account="test", folder="INBOX", full=False)
+        mock_api.sync_folder.assert_called_once_with(
+            account="test", folder="INBOX", full=False, prefetch_bodies=0
+        )
 
     @patch("clerk.mcp_server.get_api")
     @patch("clerk.mcp_server.ensure_dirs")
@@ -289,7 +291,9 @@ class TestClerkSync:
         mock_get_api.return_value = mock_api
 
         clerk_sync(account="test", full=True)
-        mock_api.sync_folder.assert_called_once_with(account="test", folder="INBOX", full=True)
+        mock_api.sync_folder.assert_called_once_with(
+            account="test", folder="INBOX", full=True, prefetch_bodies=0
+        )
 
 
 # --- clerk_reply ---
@@ -447,6 +451,21 @@ class TestClerkMoveRedesign:
         assert result["status"] == "success"
         mock_api.move_message.assert_called_once()
 
+    @patch("clerk.mcp_server.get_api")
+    @patch("clerk.mcp_server.ensure_dirs")
+    def test_move_list_uses_batch(self, _dirs, mock_get_api):
+        from clerk.mcp_server import clerk_move
+
+        mock_api = MagicMock()
+        mock_get_api.return_value = mock_api
+
+        result = clerk_move(message_id=["<msg1>", "<msg2>"], to_folder="Archive")
+        assert result["status"] == "success"
+        mock_api.move_messages.assert_called_once_with(
+            ["<msg1>", "<msg2>"], "Archive", from_folder="INBOX", account=None
+        )
+        mock_api.move_message.assert_not_called()
+
 
 # --- clerk_flag ---
 
@@ -493,6 +512,20 @@ class TestClerkFlagRedesign:
             "<msg1>", MessageFlag.SEEN, False, account=None
         )
 
+    @patch("clerk.mcp_server.get_api")
+    @patch("clerk.mcp_server.ensure_dirs")
+    def test_list_uses_batch(self, _dirs, mock_get_api):
+        from clerk.mcp_server import clerk_flag
+
+        mock_api = MagicMock()
+        mock_get_api.return_value = mock_api
+
+        result = clerk_flag(message_id=["<msg1>", "<msg2>"], action="read")
+        assert result["status"] == "success"
+        mock_api.set_flag_many.assert_called_once_with(
+            ["<msg1>", "<msg2>"], MessageFlag.SEEN, True, account=None
+        )
+
     @patch("clerk.mcp_server.get_api")
     @patch("clerk.mcp_server.ensure_dirs")
     def test_invalid_action(self, _dirs, mock_get_api):
@@ -735,7 +768,7 @@ class TestClerkSyncAll:
         assert result["total_synced"] == 17
         assert result["accounts"]["siue"]["synced"] == 5
         assert result["accounts"]["gmail"]["synced"] == 12
-        mock_api.sync_all.assert_called_once_with(folder="INBOX", full=False)
+        mock_api.sync_all.assert_called_once_with(folder="INBOX", full=False, prefetch_bodies=0)
 
     @patch("clerk.mcp_server.get_api")
     @patch("clerk.mcp_server.ensure_dirs")
@@ -749,7 +782,9 @@ class TestClerkSyncAll:
         result = clerk_sync(account="siue")
 
         assert result["synced"] == 5
-        mock_api.sync_folder.assert_called_once_with(account="siue", folder="INBOX", full=False)
+        mock_api.sync_folder.assert_called_once_with(
+            account="siue", folder="INBOX", full=False, prefetch_bodies=0
+        )
 
 
 # --- resource_folders caching ---
@@ -44,3 +44,10 @@ class TestParseAddressList:
         assert results[0].addr == ""
         assert results[0].name == "Towell"
         assert results[1].addr == "bob@example.com"
+
+    def test_quoted_name_with_comma(self):
+        results = parse_address_list('"Doe, John" <john@example.com>, bob@example.com')
+        assert [(a.name, a.addr) for a in results] == [
+            ("Doe, John", "john@example.com"),
+            ("", "bob@example.com"),
+        ]